@@ -109,7 +109,10 @@ def cmd_spawn(args):
     queue_dir = queue_root()
     queue_dir.mkdir(parents=True, exist_ok=True)
     queue_path = queue_dir / f"{task_id}.json"
-    queue_path.write_text(json.dumps(task, indent=2), encoding="utf-8")
+    # tmp + os.replace，队列目录被 daemon 的 inotify 监听，避免读到半截文件
+    queue_tmp = queue_path.with_name(queue_path.name + ".tmp")
+    queue_tmp.write_text(json.dumps(task, indent=2), encoding="utf-8")
+    os.replace(queue_tmp, queue_path)
     
     print(f"✓ Task spawned: {task_id}")
     print(f"  Repo: {args.repo}")
@@ -349,7 +352,9 @@ def cmd_retry(args):
     }
     
     queue_path = queue_dir / f"{task['id']}.json"
-    queue_path.write_text(json.dumps(task_data, indent=2), encoding="utf-8")
+    queue_tmp = queue_path.with_name(queue_path.name + ".tmp")
+    queue_tmp.write_text(json.dumps(task_data, indent=2), encoding="utf-8")
+    os.replace(queue_tmp, queue_path)
     
     print(f"✓ Task queued for retry: {args.task_id}")
     print(f"  Queue: {queue_path}")
@@ -14,6 +14,7 @@ from __future__ import annotations
 import json
 import os
 import sqlite3
+import sys
 import time
 from contextlib import contextmanager
 from pathlib import Path
@@ -466,6 +467,22 @@ def insert_task(task: dict) -> None:
     _mirror_task_to_control_plane(get_task(task["id"]) or task, action="sqlite_task_inserted")
 
 
+# 这些字段取值重复度极高（同一批任务共享 repo/agent/model 等），
+# sys.intern 让相同取值共享一个 str 对象，降低内存并加速相等比较。
+_INTERNED_TASK_FIELDS = ("repo", "agent", "model", "effort", "status",
+                         "execution_mode", "worktree_strategy")
+
+
+def _task_row_to_dict(row: sqlite3.Row) -> dict:
+    """Convert a task row to a dict, interning the highly repetitive fields."""
+    task = dict(row)
+    for field in _INTERNED_TASK_FIELDS:
+        value = task.get(field)
+        if isinstance(value, str):
+            task[field] = sys.intern(value)
+    return task
+
+
 def get_task(task_id: str) -> Optional[dict]:
     """Get a single task by ID"""
     with get_db() as conn:
@@ -474,7 +491,7 @@ def get_task(task_id: str) -> Optional[dict]:
             (task_id,)
         )
         row = cursor.fetchone()
-        return dict(row) if row else None
+        return _task_row_to_dict(row) if row else None
 
 
 def _parse_metadata(raw_metadata: Any) -> dict[str, Any]:
@@ -525,7 +542,7 @@ def get_task_by_branch(branch: str) -> Optional[dict]:
             (branch,)
         )
         row = cursor.fetchone()
-        return dict(row) if row else None
+        return _task_row_to_dict(row) if row else None
 
 
 def get_task_by_tmux_session(session: str) -> Optional[dict]:
@@ -536,7 +553,7 @@ def get_task_by_tmux_session(session: str) -> Optional[dict]:
             (session,)
         )
         row = cursor.fetchone()
-        return dict(row) if row else None
+        return _task_row_to_dict(row) if row else None
 
 
 def get_task_by_process_id(pid: int) -> Optional[dict]:
@@ -547,7 +564,7 @@ def get_task_by_process_id(pid: int) -> Optional[dict]:
             (pid,)
         )
         row = cursor.fetchone()
-        return dict(row) if row else None
+        return _task_row_to_dict(row) if row else None
 
 
 def mark_cleaned_up(task_id: str) -> None:
@@ -562,7 +579,7 @@ def get_tasks_by_plan(plan_id: str) -> list[dict]:
             "SELECT * FROM agent_tasks WHERE plan_id = ? ORDER BY id",
             (plan_id,)
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [_task_row_to_dict(row) for row in cursor.fetchall()]
 
 
 def get_running_tasks() -> list[dict]:
@@ -571,7 +588,7 @@ def get_running_tasks() -> list[dict]:
         cursor = conn.execute(
             "SELECT * FROM agent_tasks WHERE status IN ('running', 'pr_created', 'retrying') ORDER BY started_at"
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [_task_row_to_dict(row) for row in cursor.fetchall()]
 
 
 def get_queued_tasks() -> list[dict]:
@@ -580,7 +597,7 @@ def get_queued_tasks() -> list[dict]:
         cursor = conn.execute(
             "SELECT * FROM agent_tasks WHERE status = 'queued' ORDER BY created_at"
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [_task_row_to_dict(row) for row in cursor.fetchall()]
 
 
 def get_all_tasks(limit: int = 50) -> list[dict]:
@@ -590,7 +607,7 @@ def get_all_tasks(limit: int = 50) -> list[dict]:
             "SELECT * FROM agent_tasks ORDER BY created_at DESC LIMIT ?",
             (limit,)
         )
-        return [dict(row) for row in cursor.fetchall()]
+        return [_task_row_to_dict(row) for row in cursor.fetchall()]
 
 
 def update_task(task_id: str, updates: dict) -> None:
@@ -536,7 +536,11 @@ def dispatch_ready_subtasks(
         _validate_subtask_scope(plan, subtask, root)
         task_payload = build_execution_task(plan, subtask)
         queue_path = queue_root / f"{task_payload['id']}.json"
-        queue_path.write_text(json.dumps(task_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        # 先写临时文件再 os.replace：daemon 的 inotify 唤醒只会看到完整文件，
+        # 不会把写到一半的队列 JSON 当坏任务送进 dead/。
+        queue_tmp = queue_path.with_name(queue_path.name + ".tmp")
+        queue_tmp.write_text(json.dumps(task_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(queue_tmp, queue_path)
         timestamp = int(time.time() * 1000)
         dispatched[subtask.id] = {
             "state": "queued",
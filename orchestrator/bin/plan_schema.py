@@ -4,6 +4,7 @@ from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
 import json
+import os
 import re
 from pathlib import Path
 from typing import Any, List
@@ -24,6 +25,11 @@ try:
 except ImportError:
     from errors import InvalidPlan
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 ALLOWED_AGENTS = {"codex", "claude"}
 ALLOWED_EFFORTS = {"low", "medium", "high"}
 ALLOWED_WORKTREE_STRATEGIES = {"shared", "isolated"}
@@ -340,17 +346,23 @@ class Plan:
         return payload
 
     def write_json(self, path: Path) -> None:
-        path.write_text(
-            json.dumps(self.to_dict(), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        # 先写临时文件再 os.replace：daemon/dispatch 可能并发读取 plan 文件，
+        # 避免崩溃或中断时留下半截 JSON。
+        if orjson is not None:
+            data = orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.to_dict(), ensure_ascii=False, indent=2).encode("utf-8")
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
 
 
 def load_plan(path: Path) -> Plan:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        raw = path.read_bytes()
+        payload = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except FileNotFoundError as exc:
         raise InvalidPlan(f"Plan file not found: {path}") from exc
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise InvalidPlan(f"Plan file is not valid JSON: {path}") from exc
     return Plan.from_dict(payload)
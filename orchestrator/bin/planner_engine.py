@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 import json
 import os
 from pathlib import Path
 import re
+import time
 from typing import Any, Mapping
 
 try:
@@ -178,14 +181,20 @@ CODE_FILE_EXTENSIONS = (
     ".prisma",
     ".sh",
 )
-CONFIG_FALLBACK_FILES = (
-    "package.json",
-    "pyproject.toml",
-    "go.mod",
-    "cargo.toml",
-    "tsconfig.json",
-    "next.config.js",
-    "prisma/schema.prisma",
+# Threaded repo scanning; set ZOE_PLANNER_PARALLEL_SCAN=0 on filesystems where
+# concurrent readdir/stat does not help (e.g. network mounts with low parallelism).
+PARALLEL_REPO_SCAN = os.getenv("ZOE_PLANNER_PARALLEL_SCAN", "1") != "0"
+# frozenset: only ever used for exact-match membership tests.
+CONFIG_FALLBACK_FILES = frozenset(
+    {
+        "package.json",
+        "pyproject.toml",
+        "go.mod",
+        "cargo.toml",
+        "tsconfig.json",
+        "next.config.js",
+        "prisma/schema.prisma",
+    }
 )
 
 
@@ -275,6 +284,24 @@ def _ranked_file_subset(
     return _dedupe(chosen + fallback)[:max_items]
 
 
+# Most repos only contain a few of the REPO_SCAN_ROOTS; remember the misses so
+# repeated plan() calls do not re-stat directories that were absent moments ago.
+_NEG_DIR_CACHE: dict[Path, float] = {}
+_NEG_DIR_TTL_SECONDS = 60.0
+
+
+def _scan_root_is_dir(path: Path) -> bool:
+    expiry = _NEG_DIR_CACHE.get(path)
+    if expiry is not None:
+        if expiry > time.monotonic():
+            return False
+        _NEG_DIR_CACHE.pop(path, None)
+    if path.is_dir():
+        return True
+    _NEG_DIR_CACHE[path] = time.monotonic() + _NEG_DIR_TTL_SECONDS
+    return False
+
+
 def _repo_root(repo: str) -> Path:
     base_dir = Path(os.getenv("AI_DEVOPS_HOME", str(Path.home() / "ai-devops")))
     return base_dir / "repos" / repo
@@ -329,37 +356,53 @@ def _priority_score(path: str) -> int:
 
 def _discover_repo_file_hints(repo: str, *, max_items: int = 6) -> list[str]:
     repo_root = _repo_root(repo)
-    if not repo_root.exists() or not repo_root.is_dir():
+    try:
+        st = repo_root.stat()
+    except OSError:
         return []
+    if not repo_root.is_dir():
+        return []
+    # Key the walk on the resolved root + its mtime so back-to-back plans for
+    # the same repo (one per subtask dispatch) reuse the ranked hints. The root
+    # goes into the key because AI_DEVOPS_HOME can change between calls and the
+    # bare repo name would alias same-named repos under different base dirs.
+    return list(_discover_repo_file_hints_cached(str(repo_root), st.st_mtime_ns, max_items))
+
 
+@lru_cache(maxsize=64)
+def _discover_repo_file_hints_cached(repo_root_str: str, mtime_ns: int, max_items: int) -> tuple[str, ...]:
+    repo_root = Path(repo_root_str)
     candidates: list[str] = []
+    # os.scandir hands back DirEntry objects whose is_dir()/is_file() reuse
+    # the readdir results, avoiding a stat(2) per entry.
     for relative_root in REPO_SCAN_ROOTS:
         root = repo_root / relative_root if relative_root else repo_root
-        if not root.exists() or not root.is_dir():
+        if relative_root and not _scan_root_is_dir(root):
             continue
         try:
-            entries = sorted(root.iterdir(), key=lambda item: item.name.lower())
+            with os.scandir(root) as it:
+                entries = sorted(it, key=lambda item: item.name.lower())
         except OSError:
             continue
         for entry in entries:
             if entry.name.startswith("."):
                 continue
             if entry.is_dir():
-                nested: list[Path] = []
                 try:
-                    nested = sorted(entry.iterdir(), key=lambda item: item.name.lower())[:4]
+                    with os.scandir(entry.path) as nested_it:
+                        nested = sorted(nested_it, key=lambda item: item.name.lower())[:4]
                 except OSError:
                     nested = []
                 for child in nested:
                     if child.name.startswith(".") or child.is_dir():
                         continue
-                    candidates.append(str(child.relative_to(repo_root)))
+                    candidates.append(os.path.relpath(child.path, repo_root))
             elif entry.is_file():
-                candidates.append(str(entry.relative_to(repo_root)))
+                candidates.append(os.path.relpath(entry.path, repo_root))
 
     unique = _dedupe(candidates)
     ranked = sorted(unique, key=lambda path: (-_priority_score(path), path.lower()))
-    return ranked[:max_items]
+    return tuple(ranked[:max_items])
 
 
 def _code_priority_score(path: str) -> int:
@@ -410,6 +453,25 @@ def _test_priority_score(path: str) -> int:
     return score
 
 
+def _scan_phase_root(repo_root: Path, root: Path) -> list[str]:
+    if not _scan_root_is_dir(root):
+        return []
+    found: list[str] = []
+    try:
+        for child in root.rglob("*"):
+            if not child.is_file():
+                continue
+            if any(part.startswith(".") for part in child.relative_to(repo_root).parts):
+                continue
+            depth = len(child.relative_to(root).parts)
+            if depth > 3:
+                continue
+            found.append(str(child.relative_to(repo_root)))
+    except OSError:
+        pass
+    return found
+
+
 def _discover_repo_phase_hints(
     repo: str,
     *,
@@ -421,34 +483,51 @@ def _discover_repo_phase_hints(
     if not repo_root.exists() or not repo_root.is_dir():
         return {"implementation": [], "tests": [], "docs": []}
 
+    roots = [repo_root / relative_root if relative_root else repo_root for relative_root in REPO_SCAN_ROOTS]
     candidates: list[str] = []
-    for relative_root in REPO_SCAN_ROOTS:
-        root = repo_root / relative_root if relative_root else repo_root
-        if not root.exists() or not root.is_dir():
-            continue
-        try:
-            for child in root.rglob("*"):
-                if not child.is_file():
-                    continue
-                if any(part.startswith(".") for part in child.relative_to(repo_root).parts):
-                    continue
-                depth = len(child.relative_to(root).parts)
-                if depth > 3:
-                    continue
-                candidates.append(str(child.relative_to(repo_root)))
-        except OSError:
-            continue
+    if PARALLEL_REPO_SCAN and len(roots) > 1:
+        # rglob is stat/readdir-bound and the GIL releases on those syscalls,
+        # so the per-root walks can overlap. Futures are consumed in submit
+        # order to keep candidate ordering deterministic.
+        with ThreadPoolExecutor(max_workers=min(8, len(roots))) as executor:
+            futures = [executor.submit(_scan_phase_root, repo_root, root) for root in roots]
+            for future in futures:
+                candidates.extend(future.result())
+    else:
+        for root in roots:
+            candidates.extend(_scan_phase_root(repo_root, root))
 
     unique = _dedupe(candidates)
-    docs = [path for path in unique if path.lower().endswith(".md") or path.lower().startswith("docs/")]
-    tests = [path for path in unique if _test_priority_score(path) > 0]
-    implementation = [path for path in unique if _code_priority_score(path) > 0 and path not in tests]
-    config_fallback = [path for path in unique if path.lower() in CONFIG_FALLBACK_FILES]
+    # Decorate-sort-undedecorate: score each path once in a single pass instead
+    # of recomputing scores inside per-list sort keys.
+    doc_decorated: list[tuple[int, str, str]] = []
+    test_decorated: list[tuple[int, str, str]] = []
+    impl_decorated: list[tuple[int, str, str]] = []
+    test_paths: set[str] = set()
+    config_fallback: list[str] = []
+    for path in unique:
+        lowered = path.lower()
+        if lowered.endswith(".md") or lowered.startswith("docs/"):
+            doc_decorated.append((-_priority_score(path), lowered, path))
+        test_score = _test_priority_score(path)
+        if test_score > 0:
+            test_decorated.append((-test_score, lowered, path))
+            test_paths.add(path)
+        if lowered in CONFIG_FALLBACK_FILES:
+            config_fallback.append(path)
+    for path in unique:
+        if path in test_paths:
+            continue
+        code_score = _code_priority_score(path)
+        if code_score > 0:
+            impl_decorated.append((-code_score, path.lower(), path))
 
-    implementation = sorted(implementation, key=lambda path: (-_code_priority_score(path), path.lower()))
-    tests = sorted(tests, key=lambda path: (-_test_priority_score(path), path.lower()))
-    docs = sorted(docs, key=lambda path: (-_priority_score(path), path.lower()))
-    implementation = _dedupe(implementation + config_fallback)
+    impl_decorated.sort()
+    test_decorated.sort()
+    doc_decorated.sort()
+    implementation = _dedupe([path for _, _, path in impl_decorated] + config_fallback)
+    tests = [path for _, _, path in test_decorated]
+    docs = [path for _, _, path in doc_decorated]
 
     return {
         "implementation": implementation[:max_implementation],
@@ -475,6 +554,17 @@ def _merge_definition_of_done(phase_items: list[str], global_items: list[str]) -
     return _dedupe(phase_items + global_items)
 
 
+@lru_cache(maxsize=16)
+def _build_prompt_header(repo: str, plan_title: str) -> tuple[str, ...]:
+    """Shared prompt preamble; identical for every subtask of a plan."""
+    return (
+        "You are Zoe executing one subtask from a multi-step repository plan.",
+        "",
+        f"REPOSITORY: {repo}",
+        f"PLAN TITLE: {plan_title}",
+    )
+
+
 def _build_prompt(
     *,
     repo: str,
@@ -489,21 +579,21 @@ def _build_prompt(
     depends_on: list[str],
     phase_boundary: str,
 ) -> str:
+    allowed_paths = _constraint_path_list(constraints, "allowedPaths")
+    forbidden_paths = _constraint_path_list(constraints, "forbiddenPaths", "blockedPaths")
+    must_touch = _constraint_path_list(constraints, "mustTouch", "requiredTouchedPaths")
     task_spec = {
         "repo": repo,
         "subtaskId": subtask_id,
         "subtaskTitle": subtask_title,
         "filesHint": files_hint,
-        "allowedPaths": _constraint_path_list(constraints, "allowedPaths"),
-        "forbiddenPaths": _constraint_path_list(constraints, "forbiddenPaths", "blockedPaths"),
-        "mustTouch": _constraint_path_list(constraints, "mustTouch", "requiredTouchedPaths"),
+        "allowedPaths": allowed_paths,
+        "forbiddenPaths": forbidden_paths,
+        "mustTouch": must_touch,
         "definitionOfDone": definition_of_done,
     }
     lines = [
-        "You are Zoe executing one subtask from a multi-step repository plan.",
-        "",
-        f"REPOSITORY: {repo}",
-        f"PLAN TITLE: {plan_title}",
+        *_build_prompt_header(repo, plan_title),
         f"SUBTASK: {subtask_id} - {subtask_title}",
         "",
         "PLAN OBJECTIVE:",
@@ -534,9 +624,6 @@ def _build_prompt(
     )
     if constraints:
         lines.append("- Respect the explicit constraints attached to this plan.")
-        allowed_paths = _constraint_path_list(constraints, "allowedPaths")
-        forbidden_paths = _constraint_path_list(constraints, "forbiddenPaths", "blockedPaths")
-        must_touch = _constraint_path_list(constraints, "mustTouch", "requiredTouchedPaths")
         if allowed_paths:
             lines.extend(["", "ALLOWED PATHS (hard boundary):"])
             lines.extend(f"- {item}" for item in allowed_paths)
@@ -552,7 +639,7 @@ def _build_prompt(
     if files_hint:
         lines.extend(["", "FILES TO CHECK FIRST:"])
         lines.extend(f"- {item}" for item in files_hint)
-    if constraints and (_constraint_path_list(constraints, "allowedPaths") or _constraint_path_list(constraints, "mustTouch", "requiredTouchedPaths")):
+    if constraints and (allowed_paths or must_touch):
         lines.extend(
             [
                 "",
@@ -661,7 +748,6 @@ def _phase_files(
     constraints: Mapping[str, Any],
 ) -> dict[str, list[str]]:
     context_terms = _keyword_tokens(f"{title} {objective}")
-    discovered = _discover_repo_phase_hints(repo)
     scope_locked = bool(
         _constraint_path_list(constraints, "allowedPaths")
         or _constraint_path_list(constraints, "mustTouch", "requiredTouchedPaths")
@@ -671,10 +757,18 @@ def _phase_files(
         test_files = list(profile.test_files) or implementation_files or list(profile.files_hint)
         doc_files = list(profile.doc_files) or implementation_files or list(profile.files_hint)
     elif has_explicit_files_hint:
-        implementation_files = list(profile.implementation_files) or discovered["implementation"]
-        test_files = list(profile.test_files) or discovered["tests"]
-        doc_files = list(profile.doc_files) or discovered["docs"]
+        # Only walk the repo when the explicit hints leave a phase empty;
+        # the common path with complete hints skips discovery entirely.
+        implementation_files = list(profile.implementation_files)
+        test_files = list(profile.test_files)
+        doc_files = list(profile.doc_files)
+        if not (implementation_files and test_files and doc_files):
+            discovered = _discover_repo_phase_hints(repo)
+            implementation_files = implementation_files or discovered["implementation"]
+            test_files = test_files or discovered["tests"]
+            doc_files = doc_files or discovered["docs"]
     else:
+        discovered = _discover_repo_phase_hints(repo)
         implementation_files = discovered["implementation"]
         test_files = discovered["tests"]
         doc_files = discovered["docs"]
@@ -1030,6 +1124,15 @@ def _plan_code_change_tasks(
     return subtasks
 
 
+# O(1) dispatch over the task shape; the code branch additionally receives
+# has_explicit_files_hint at the call site.
+_PLAN_BUILDERS = {
+    "analysis": _plan_analysis_task,
+    "docs": _plan_docs_only_task,
+    "code": _plan_code_change_tasks,
+}
+
+
 @dataclass(slots=True)
 class ZoePlannerEngine:
     """
@@ -1069,11 +1172,11 @@ class ZoePlannerEngine:
         if success_patterns:
             constraints.setdefault("successPatterns", success_patterns)
         explicit_files_hint = context.get("filesHint")
-        if not isinstance(explicit_files_hint, list):
+        if isinstance(explicit_files_hint, list):
+            # _dedupe strips and drops empties, so one str() per item is enough.
+            explicit_files_hint = _dedupe([str(item) for item in explicit_files_hint])
+        else:
             explicit_files_hint = []
-        explicit_files_hint = _dedupe(
-            [str(item).strip() for item in explicit_files_hint if str(item).strip()]
-        )
         constrained_files_hint = _constraint_file_hints(repo, constraints)
         has_explicit_files_hint = bool(explicit_files_hint or constrained_files_hint)
         files_hint = explicit_files_hint or constrained_files_hint or _discover_repo_file_hints(repo)
@@ -1090,43 +1193,21 @@ class ZoePlannerEngine:
             constraints=constraints,
         )
 
-        if profile.analysis_only:
-            subtasks = _plan_analysis_task(
-                repo=repo,
-                title=title,
-                objective=objective,
-                constraints=constraints,
-                profile=profile,
-                agent=agent,
-                model=model,
-                effort=effort,
-                global_dod=definition_of_done,
-            )
-        elif profile.docs_only:
-            subtasks = _plan_docs_only_task(
-                repo=repo,
-                title=title,
-                objective=objective,
-                constraints=constraints,
-                profile=profile,
-                agent=agent,
-                model=model,
-                effort=effort,
-                global_dod=definition_of_done,
-            )
-        else:
-            subtasks = _plan_code_change_tasks(
-                repo=repo,
-                title=title,
-                objective=objective,
-                constraints=constraints,
-                profile=profile,
-                agent=agent,
-                model=model,
-                effort=effort,
-                global_dod=definition_of_done,
-                has_explicit_files_hint=has_explicit_files_hint,
-            )
+        builder_key = "analysis" if profile.analysis_only else "docs" if profile.docs_only else "code"
+        builder_kwargs: dict[str, Any] = {
+            "repo": repo,
+            "title": title,
+            "objective": objective,
+            "constraints": constraints,
+            "profile": profile,
+            "agent": agent,
+            "model": model,
+            "effort": effort,
+            "global_dod": definition_of_done,
+        }
+        if builder_key == "code":
+            builder_kwargs["has_explicit_files_hint"] = has_explicit_files_hint
+        subtasks = _PLAN_BUILDERS[builder_key](**builder_kwargs)
 
         context.setdefault(
             "planner",
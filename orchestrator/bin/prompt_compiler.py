@@ -1,29 +1,25 @@
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
+from string import Template
 
-def compile_prompt(task: dict, repo_root: Path) -> str:
-    """
-    MVP: 先用模板 prompt 跑通。
-    后续：如果 Zoe planner 没有提供 prompt，再在这里补更强的本地编译逻辑。
-    """
-    title = task.get("title", "")
-    desc = task.get("description", "")
+try:
+    from packages.shared.utils import json_codec
+except ImportError:  # pragma: no cover - standalone invocation without repo root on sys.path
+    json_codec = None
 
-    # 你可以在 repo 里放一个 CONTEXT.md / SPEC.md，供 prompt 自动引用
-    context_files = ["SPEC.md", "CONTEXT.md", "README.md"]
-    existing = [f for f in context_files if (repo_root / f).exists()]
+# 你可以在 repo 里放一个 CONTEXT.md / SPEC.md，供 prompt 自动引用
+CONTEXT_FILES = ("SPEC.md", "CONTEXT.md", "README.md")
 
-    context_hint = ""
-    if existing:
-        context_hint = "Useful context files:\n" + "\n".join([f"- {f}" for f in existing])
-
-    return f"""You are a senior engineer working in this repository.
+# 模板只在模块加载时解析一次；每次 spawn 仅做变量替换。
+_PROMPT_TEMPLATE = Template("""You are a senior engineer working in this repository.
 
 TASK TITLE:
-{title}
+$title
 
 TASK DESCRIPTION:
-{desc}
+$desc
 
 DEFINITION OF DONE:
 - Implement the change
@@ -37,15 +33,42 @@ CONSTRAINTS:
 - Do not change unrelated formatting
 - If uncertain, search within repo first, then decide
 
-{context_hint}
+$context_hint
 
 FIRST STEP:
 - Identify relevant files and write a short plan.
-"""
+""")
+
+
+@lru_cache(maxsize=64)
+def _existing_context_files(repo_root: str, mtime_ns: int) -> tuple[str, ...]:
+    return tuple(f for f in CONTEXT_FILES if os.path.isfile(os.path.join(repo_root, f)))
+
+
+def compile_prompt(task: dict, repo_root: Path) -> str:
+    """
+    MVP: 先用模板 prompt 跑通。
+    后续：如果 Zoe planner 没有提供 prompt，再在这里补更强的本地编译逻辑。
+    """
+    title = task.get("title", "")
+    desc = task.get("description", "")
+
+    try:
+        mtime_ns = os.stat(repo_root).st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    existing = _existing_context_files(str(repo_root), mtime_ns)
+
+    context_hint = ""
+    if existing:
+        context_hint = "Useful context files:\n" + "\n".join([f"- {f}" for f in existing])
+
+    return _PROMPT_TEMPLATE.substitute(title=title, desc=desc, context_hint=context_hint)
 
 if __name__ == "__main__":
     import sys
     task_path = Path(sys.argv[1])
     repo_root = Path(sys.argv[2])
-    task = json.loads(task_path.read_text(encoding="utf-8"))
+    raw = task_path.read_bytes()
+    task = json_codec.loads(raw) if json_codec is not None else json.loads(raw)
     print(compile_prompt(task, repo_root))
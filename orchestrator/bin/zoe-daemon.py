@@ -9,6 +9,8 @@ import fnmatch
 import hashlib
 import json
 import os
+import queue as queue_module
+import re
 import shlex
 import shutil
 import subprocess
@@ -35,11 +37,11 @@ except ImportError:
     from global_scheduler import get_global_scheduler, GlobalScheduler
 
 try:
-    from .db import configure_control_plane_dual_write, init_db, get_task, insert_task, get_running_tasks
+    from .db import DB_PATH, configure_control_plane_dual_write, init_db, get_task, insert_task, get_running_tasks
     from .process_guardian import ProcessGuardian
     from .heartbeat import update_heartbeat
 except ImportError:
-    from db import configure_control_plane_dual_write, init_db, get_task, insert_task, get_running_tasks
+    from db import DB_PATH, configure_control_plane_dual_write, init_db, get_task, insert_task, get_running_tasks
     from process_guardian import ProcessGuardian
     from heartbeat import update_heartbeat
 
@@ -49,6 +51,14 @@ except ImportError:
     def get_event_manager():  # type: ignore[no-redef]
         return None
 
+# watchdog 可选：缺失时退回 2 秒轮询
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore[assignment,misc]
+    Observer = None  # type: ignore[assignment]
+
 
 def _agent_runner_codex() -> Path:
     return Path(os.getenv("CODEX_RUNNER_PATH", str(ai_devops_home() / "agent_scripts" / "run-codex-agent.sh")))
@@ -74,40 +84,100 @@ from packages.context.packer.service import ContextPackAssembler
 from packages.kernel.runtime.services import AgentLauncher, QueueConsumer, RunStateRecorder, WorkspaceManager
 from packages.kernel.services.work_items import MissingContextPackError, WorkItemService
 from packages.shared.domain.runtime_state import configure_runtime_persistence
+from packages.shared.utils import json_codec
+
+
+# \w matches what the old per-char isalnum() walk kept (plus underscore,
+# which was allowed explicitly); runs of dashes collapse in one pass.
+_BRANCH_INVALID_RE = re.compile(r"[^\w\-/]")
+_BRANCH_DASH_RUN_RE = re.compile(r"-{2,}")
 
 
 def sanitize_branch_component(value: str) -> str:
-    cleaned = "".join(ch if ch.isalnum() or ch in ("-", "_", "/") else "-" for ch in value.strip())
-    while "--" in cleaned:
-        cleaned = cleaned.replace("--", "-")
+    cleaned = _BRANCH_INVALID_RE.sub("-", value.strip())
+    cleaned = _BRANCH_DASH_RUN_RE.sub("-", cleaned)
     return cleaned.strip("-_/") or "task"
 
 
+def _decode_output(raw) -> str:
+    if isinstance(raw, bytes):
+        return raw.decode("utf-8", "replace")
+    return raw or ""
+
+
 def sh(cmd: list[str], cwd: Optional[Path] = None, check: bool = True) -> str:
+    # Captured as bytes; most callers discard the output, so stderr is only
+    # decoded when formatting a failure and stdout only after stripping.
     r = subprocess.run(
         cmd,
         cwd=str(cwd) if cwd else None,
         capture_output=True,
-        text=True,
     )
     if check and r.returncode != 0:
         raise RuntimeError(
             f"Command failed: {' '.join(cmd)}\n"
             f"CWD: {cwd}\n"
-            f"STDOUT:\n{r.stdout}\n"
-            f"STDERR:\n{r.stderr}\n"
+            f"STDOUT:\n{_decode_output(r.stdout)}\n"
+            f"STDERR:\n{_decode_output(r.stderr)}\n"
         )
-    return (r.stdout or "").strip()
+    out = r.stdout or b""
+    if isinstance(out, bytes):
+        return _decode_output(out.strip())
+    return out.strip()
+
+
+# shutil.which 是一次 PATH 扫描（每个条目一次 stat），而答案在 daemon
+# 生命周期内不变；首次调用后缓存，后续 spawn 零开销。
+_TMUX_BIN: Optional[str] = None
+_TMUX_BIN_RESOLVED = False
+
+
+def _tmux_bin() -> Optional[str]:
+    global _TMUX_BIN, _TMUX_BIN_RESOLVED
+    if not _TMUX_BIN_RESOLVED:
+        _TMUX_BIN = shutil.which("tmux")
+        _TMUX_BIN_RESOLVED = True
+    return _TMUX_BIN
 
 
 def tmux_available() -> bool:
-    return shutil.which("tmux") is not None
+    return _tmux_bin() is not None
+
+
+# One `tmux list-sessions` per sweep instead of one `tmux has-session`
+# subprocess per spawn. main() refreshes the snapshot before draining the
+# queue; outside the sweep tmux_has falls back to the per-session probe.
+_TMUX_SESSIONS_SNAPSHOT: Optional[set[str]] = None
+
+
+def _refresh_tmux_sessions() -> None:
+    global _TMUX_SESSIONS_SNAPSHOT
+    if not tmux_available():
+        _TMUX_SESSIONS_SNAPSHOT = None
+        return
+    r = subprocess.run(
+        [_tmux_bin() or "tmux", "list-sessions", "-F", "#{session_name}"],
+        capture_output=True,
+        text=True,
+    )
+    if r.returncode != 0:
+        # No server running yet: no sessions exist.
+        _TMUX_SESSIONS_SNAPSHOT = set()
+        return
+    _TMUX_SESSIONS_SNAPSHOT = {line.strip() for line in r.stdout.splitlines() if line.strip()}
+
+
+def _invalidate_tmux_snapshot() -> None:
+    global _TMUX_SESSIONS_SNAPSHOT
+    _TMUX_SESSIONS_SNAPSHOT = None
 
 
 def tmux_has(session: str) -> bool:
     if not tmux_available():
         return False
-    r = subprocess.run(["tmux", "has-session", "-t", session], capture_output=True, text=True)
+    if _TMUX_SESSIONS_SNAPSHOT is not None:
+        return session in _TMUX_SESSIONS_SNAPSHOT
+    r = subprocess.run([_tmux_bin() or "tmux", "has-session", "-t", session], capture_output=True, text=True)
     return r.returncode == 0
 
 
@@ -134,6 +204,38 @@ def _detect_default_branch(repo_root: Path) -> str:
     return "origin/main"
 
 
+# 每轮 sweep 同一仓库只 fetch 一次；main() 在每轮开始时清空。
+_FETCHED_THIS_SWEEP: set[str] = set()
+
+
+def _fetch_origin_once(repo_root: Path) -> None:
+    key = str(repo_root)
+    if key in _FETCHED_THIS_SWEEP:
+        return
+    sh(["git", "fetch", "origin"], cwd=repo_root)
+    _FETCHED_THIS_SWEEP.add(key)
+
+
+# 缺省分支 SHA 的 sweep 级缓存；fetch 可能移动远端引用，随 sweep 一起清空。
+_DEFAULT_BRANCH_BASE: dict[str, str] = {}
+
+
+def _resolve_worktree_base(repo_root: Path, default_branch: str) -> str:
+    """Resolve the default branch to a SHA once per sweep.
+
+    Passing the SHA to `git worktree add` skips refname resolution in each
+    subprocess; when rev-parse yields nothing we fall back to the ref name.
+    """
+    key = f"{repo_root}:{default_branch}"
+    cached = _DEFAULT_BRANCH_BASE.get(key)
+    if cached:
+        return cached
+    sha = sh(["git", "rev-parse", "--verify", default_branch], cwd=repo_root, check=False).strip()
+    base = sha or default_branch
+    _DEFAULT_BRANCH_BASE[key] = base
+    return base
+
+
 def create_worktree(repo_root: Path, branch: str) -> Path:
     """Create a worktree based on the detected remote default branch."""
     wt_base = worktrees_dir()
@@ -144,10 +246,11 @@ def create_worktree(repo_root: Path, branch: str) -> Path:
         # 目录已存在时视为已完成预置，直接复用。
         return wt_dir
 
-    sh(["git", "fetch", "origin"], cwd=repo_root)
+    _fetch_origin_once(repo_root)
 
     default_branch = _detect_default_branch(repo_root)
-    sh(["git", "worktree", "add", str(wt_dir), "-b", branch, default_branch], cwd=repo_root)
+    base = _resolve_worktree_base(repo_root, default_branch)
+    sh(["git", "worktree", "add", str(wt_dir), "-b", branch, base], cwd=repo_root)
     return wt_dir
 
 
@@ -227,7 +330,7 @@ def _write_scope_manifest(wt_dir: Path, repo_root: Path, task_spec: dict) -> Pat
         'sparsePatterns': _scope_patterns_from_task_spec(task_spec, repo_root),
     }
     target = contract_dir / 'scope-manifest.json'
-    target.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    target.write_bytes(json_codec.dumps_bytes(manifest, indent=True))
     return target
 
 
@@ -242,7 +345,9 @@ def _apply_sparse_checkout_if_scoped(repo_root: Path, wt_dir: Path, task_spec: d
 
 
 def resolve_branch(task: dict) -> str:
-    metadata = task.get("metadata") if isinstance(task.get("metadata"), dict) else {}
+    metadata = task.get("metadata")
+    if not isinstance(metadata, dict):
+        metadata = {}
     worktree_strategy = metadata.get("worktreeStrategy")
     if worktree_strategy == "shared" and metadata.get("planId"):
         return f"plan/{sanitize_branch_component(str(metadata['planId']))}"
@@ -284,7 +389,9 @@ def launch_agent_process(
             f"{env_prefix}{shlex.quote(str(runner))} {shlex.quote(task['id'])} {shlex.quote(model)}"
             f" {shlex.quote(effort)} {shlex.quote(str(wt_dir))} {shlex.quote(prompt_txt.name)}"
         )
-        sh(["tmux", "new-session", "-d", "-s", session, "-c", str(wt_dir), cmd])
+        sh([_tmux_bin() or "tmux", "new-session", "-d", "-s", session, "-c", str(wt_dir), cmd])
+        if _TMUX_SESSIONS_SNAPSHOT is not None:
+            _TMUX_SESSIONS_SNAPSHOT.add(session)
         return ("tmux", session, None)
 
     process = subprocess.Popen(
@@ -353,7 +460,8 @@ def spawn_agent(task: dict) -> dict:
 
 
 def _enrich_task_with_execution_session(task: dict) -> dict:
-    metadata = dict(task.get("metadata") or {}) if isinstance(task.get("metadata"), dict) else {}
+    raw_metadata = task.get("metadata")
+    metadata = dict(raw_metadata) if isinstance(raw_metadata, dict) else {}
     if _has_execution_session_metadata(metadata):
         return {
             **task,
@@ -412,6 +520,53 @@ def _seed_task_with_stable_work_item_id(task: dict) -> dict:
     return seeded
 
 
+# Read-through cache over the SQLite tracker keyed on the DB file's
+# (mtime_ns, size): every commit rewrites the file, so a single stat per
+# lookup tells us whether previous get_task answers are still valid. This
+# keeps warm ticks from re-querying the tracker for every queue file.
+_TRACKED_CACHE: dict = {"key": None, "known": set(), "missing": set()}
+
+
+def _task_already_tracked(task_id: str) -> bool:
+    try:
+        st = os.stat(os.fspath(DB_PATH))
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        key = None
+    if key is None or key != _TRACKED_CACHE["key"]:
+        _TRACKED_CACHE["key"] = key
+        _TRACKED_CACHE["known"] = set()
+        _TRACKED_CACHE["missing"] = set()
+    if task_id in _TRACKED_CACHE["known"]:
+        return True
+    if key is not None and task_id in _TRACKED_CACHE["missing"]:
+        return False
+    if get_task(task_id) is not None:
+        _TRACKED_CACHE["known"].add(task_id)
+        return True
+    _TRACKED_CACHE["missing"].add(task_id)
+    return False
+
+
+def _mark_task_tracked(task_id: str) -> None:
+    """Write-through update after insert_task so the cache stays warm.
+
+    The insert just changed the DB file, which would otherwise invalidate the
+    whole cache and force one query per remaining queue file next sweep.
+    """
+    try:
+        st = os.stat(os.fspath(DB_PATH))
+        key = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return
+    if key != _TRACKED_CACHE["key"]:
+        _TRACKED_CACHE["key"] = key
+        _TRACKED_CACHE["known"] = set()
+        _TRACKED_CACHE["missing"] = set()
+    _TRACKED_CACHE["known"].add(task_id)
+    _TRACKED_CACHE["missing"].discard(task_id)
+
+
 def _dead_letter_task(queue_file: Path, exc: Exception) -> None:
     dead_dir = queue_file.parent / "dead"
     dead_dir.mkdir(parents=True, exist_ok=True)
@@ -441,6 +596,66 @@ def _load_queue_task(consumer: QueueConsumer, queue_file: Path) -> dict:
 
 
 
+class _QueueEventHandler(FileSystemEventHandler):  # type: ignore[misc]
+    """Pushes a wake-up token whenever a queue JSON file lands."""
+
+    def __init__(self, wake: "queue_module.Queue[str]") -> None:
+        self._wake = wake
+
+    def on_closed(self, event) -> None:
+        # close-write 而非 create：create 时文件可能尚未写完，半截 JSON 会被
+        # 误判为坏任务进 dead/。dispatch 本身走 tmp + os.replace（见 on_moved）。
+        if not event.is_directory and str(event.src_path).endswith(".json"):
+            self._wake.put(str(event.src_path))
+
+    def on_moved(self, event) -> None:
+        if not event.is_directory and str(event.dest_path).endswith(".json"):
+            self._wake.put(str(event.dest_path))
+
+
+def _start_queue_watcher(queue_path: Path) -> "queue_module.Queue[str] | None":
+    """Watch the queue directory via watchdog (inotify on Linux).
+
+    Returns the wake-up queue, or None when watchdog is unavailable so the
+    caller keeps the plain sleep-based polling loop.
+    """
+    if Observer is None:
+        return None
+    try:
+        wake: "queue_module.Queue[str]" = queue_module.Queue()
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(_QueueEventHandler(wake), str(queue_path), recursive=False)
+        observer.start()
+        return wake
+    except Exception as e:
+        print(f"[QUEUE-WATCH] Falling back to polling, watcher failed: {e}")
+        return None
+
+
+def _wait_for_queue_activity(wake: "queue_module.Queue[str] | None", poll_interval: float) -> None:
+    """Sleep until a new queue file arrives or the poll interval elapses.
+
+    The interval is kept either way so the periodic work in main() (heartbeat,
+    guardian, scheduler) retains its cadence; the watcher only removes the
+    added dispatch latency. The sweep after wake-up still globs the directory,
+    which covers files that arrived before the watcher started.
+    """
+    if wake is None:
+        time.sleep(poll_interval)
+        return
+    try:
+        wake.get(timeout=poll_interval)
+    except queue_module.Empty:
+        return
+    # Drain coalesced events; one sweep picks up the whole burst.
+    try:
+        while True:
+            wake.get_nowait()
+    except queue_module.Empty:
+        pass
+
+
 def start_api_server(port: int = 8080):
     """Start REST API server in daemon thread"""
     try:
@@ -514,7 +729,10 @@ def main() -> None:
     q = queue_dir()
     q.mkdir(parents=True, exist_ok=True)
     consumer = QueueConsumer(q)
+    queue_wake = _start_queue_watcher(q)
     print(f"Zoe daemon started. Watching queue: {q}")
+    if queue_wake is not None:
+        print("[QUEUE-WATCH] Filesystem watcher active (event-driven dispatch)")
     print(f"ProcessGuardian initialized. Monitoring agent sessions...")
 
     # 资源监控（每 30 秒采集一次）
@@ -548,6 +766,8 @@ def main() -> None:
     
     while True:
         now = time.time()
+        _FETCHED_THIS_SWEEP.clear()
+        _DEFAULT_BRANCH_BASE.clear()
         
         # 资源监控采集
         if resource_monitor and now - last_resource_collect_time >= resource_collect_interval:
@@ -601,17 +821,21 @@ def main() -> None:
             print(f"[GUARDIAN-ERROR] Check failed: {e}")
 
         # 队列处理
-        for p in consumer.list_queue_files():
+        queue_files = consumer.list_queue_files()
+        if queue_files:
+            _refresh_tmux_sessions()
+        for p in queue_files:
             try:
                 task = _load_queue_task(consumer, p)
 
-                if get_task(task["id"]) is not None:
+                if _task_already_tracked(task["id"]):
                     # 已存在跟踪记录时，删除队列项避免重复循环
                     p.unlink(missing_ok=True)
                     continue
 
                 item = spawn_agent(task)
                 insert_task(item)
+                _mark_task_tracked(item["id"])
 
                 # 添加到进程守护监控
                 if item.get("tmuxSession"):
@@ -629,8 +853,10 @@ def main() -> None:
                     continue
                 # 不删除任务文件，保留用于排查与重试
                 print(f"[ERROR] Failed processing {p}: {e}")
+        if queue_files:
+            _invalidate_tmux_snapshot()
 
-        time.sleep(2)
+        _wait_for_queue_activity(queue_wake, 2)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 from pathlib import Path
 import sys
@@ -11,14 +10,26 @@ if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
 from orchestrator.bin.errors import PlannerError, PolicyViolation
-from orchestrator.bin.zoe_tools import (
-    dispatch_plan,
-    list_plans,
-    plan_and_dispatch_task,
-    plan_task,
-    read_json_file,
-    task_status,
-)
+from packages.shared.utils import json_codec
+
+# zoe_tools 会拉起 planner engine 与 DB 层，冷启动开销大；
+# 延迟到子命令真正调用工具时再导入（--help / 参数错误路径保持轻量）。
+_LAZY_TOOL_EXPORTS = frozenset({
+    "dispatch_plan",
+    "list_plans",
+    "plan_and_dispatch_task",
+    "plan_task",
+    "read_json_file",
+    "task_status",
+})
+
+
+def __getattr__(name: str):
+    if name in _LAZY_TOOL_EXPORTS:
+        from orchestrator.bin import zoe_tools
+
+        return getattr(zoe_tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _emit_deprecation_notice() -> None:
@@ -30,7 +41,7 @@ def _emit_deprecation_notice() -> None:
 
 
 def emit_json(payload: dict[str, object]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print(json_codec.dumps(payload, indent=True))
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -69,15 +80,18 @@ def main() -> int:
     base_dir = Path(os.getenv("AI_DEVOPS_HOME", str(Path.home() / "ai-devops")))
     _emit_deprecation_notice()
 
+    # 通过模块属性访问工具函数：既触发按需导入，也保留 patch 注入点。
+    tools = sys.modules[__name__]
+
     try:
         if args.command == "plan":
-            task_input = read_json_file(args.task_file)
-            emit_json(plan_task(task_input, base_dir=base_dir).to_dict())
+            task_input = tools.read_json_file(args.task_file)
+            emit_json(tools.plan_task(task_input, base_dir=base_dir).to_dict())
             return 0
 
         if args.command == "dispatch":
             emit_json(
-                dispatch_plan(
+                tools.dispatch_plan(
                     args.plan_file,
                     base_dir=base_dir,
                     watch=args.watch,
@@ -87,9 +101,9 @@ def main() -> int:
             return 0
 
         if args.command == "plan-and-dispatch":
-            task_input = read_json_file(args.task_file)
+            task_input = tools.read_json_file(args.task_file)
             emit_json(
-                plan_and_dispatch_task(
+                tools.plan_and_dispatch_task(
                     task_input,
                     base_dir=base_dir,
                     watch=args.watch,
@@ -99,11 +113,11 @@ def main() -> int:
             return 0
 
         if args.command == "status":
-            emit_json(task_status(task_id=args.task_id, plan_id=args.plan_id, base_dir=base_dir))
+            emit_json(tools.task_status(task_id=args.task_id, plan_id=args.plan_id, base_dir=base_dir))
             return 0
 
         if args.command == "list-plans":
-            emit_json(list_plans(base_dir=base_dir, limit=args.limit))
+            emit_json(tools.list_plans(base_dir=base_dir, limit=args.limit))
             return 0
     except PolicyViolation as exc:
         print(f"POLICY_VIOLATION: {exc}", file=sys.stderr)
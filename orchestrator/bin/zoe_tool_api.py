@@ -2,17 +2,17 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 from pathlib import Path
 import sys
-from typing import Any, Callable
+from typing import Any, Callable  # Callable: _HANDLERS 的签名标注
 
 if __package__ in (None, ""):
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+from packages.shared.utils import json_codec
 from orchestrator.bin.errors import PlannerError, PolicyViolation
-from orchestrator.bin.zoe_tool_contract import tool_contracts_payload, tool_names
+from orchestrator.bin.zoe_tool_contract import tool_contracts_json
 from orchestrator.bin.zoe_tools import (
     dispatch_plan,
     list_plans,
@@ -24,66 +24,100 @@ from orchestrator.bin.zoe_tools import (
 
 
 def _emit(payload: dict[str, Any]) -> None:
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    print(json_codec.dumps(payload, indent=True))
 
 
 def _load_json_request(request_file: Path | None) -> dict[str, Any]:
+    # 直接读 bytes 交给解析器，省掉中间 str 的一次 UTF-8 解码。
     if request_file is not None:
-        raw = request_file.read_text(encoding="utf-8")
+        raw = request_file.read_bytes()
     else:
-        raw = sys.stdin.read()
+        raw = sys.stdin.buffer.read()
 
     try:
-        payload = json.loads(raw)
-    except json.JSONDecodeError as exc:
+        payload = json_codec.loads(raw)
+    except ValueError as exc:
         raise PlannerError("Request payload is not valid JSON") from exc
     if not isinstance(payload, dict):
         raise PlannerError("Request payload must be a JSON object")
     return payload
 
 
+def _handle_plan_task(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    return plan_task(args, base_dir=base_dir).to_dict()
+
+
+def _handle_plan_and_dispatch_task(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    return plan_and_dispatch_task(
+        args,
+        base_dir=base_dir,
+        watch=bool(args.get("watch", False)),
+        poll_interval_sec=float(args.get("poll_interval_sec", 5.0)),
+    ).to_dict()
+
+
+def _handle_dispatch_plan(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    plan_file = args.get("planFile")
+    if not isinstance(plan_file, str) or not plan_file.strip():
+        raise PlannerError("dispatch_plan requires args.planFile")
+    return dispatch_plan(
+        Path(plan_file),
+        base_dir=base_dir,
+        watch=bool(args.get("watch", False)),
+        poll_interval_sec=float(args.get("poll_interval_sec", 5.0)),
+    ).to_dict()
+
+
+def _handle_task_status(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    return task_status(
+        task_id=args.get("task_id"),
+        plan_id=args.get("plan_id"),
+        base_dir=base_dir,
+    )
+
+
+def _handle_list_plans(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    return list_plans(base_dir=base_dir, limit=int(args.get("limit", 10)))
+
+
+def _handle_retry_task(args: dict[str, Any], base_dir: Path) -> dict[str, Any]:
+    task_id = args.get("task_id")
+    if not isinstance(task_id, str) or not task_id.strip():
+        raise PlannerError("retry_task requires args.task_id")
+    return {"task": retry_task(task_id, reason=str(args.get("reason", "")))}
+
+
+# 工具名 → handler 的 O(1) 分发表；handler 在调用时解析模块全局，
+# 因此测试对 zoe_tool_api.plan_task 等的 patch 依然生效。
+_HANDLERS: dict[str, Callable[[dict[str, Any], Path], dict[str, Any]]] = {
+    "plan_task": _handle_plan_task,
+    "plan_and_dispatch_task": _handle_plan_and_dispatch_task,
+    "dispatch_plan": _handle_dispatch_plan,
+    "task_status": _handle_task_status,
+    "list_plans": _handle_list_plans,
+    "retry_task": _handle_retry_task,
+}
+
+
 def _dispatch_tool_call(payload: dict[str, Any], *, base_dir: Path) -> dict[str, Any]:
     tool = payload.get("tool")
     args = payload.get("args", {})
-    if not isinstance(tool, str) or tool not in tool_names():
+    handler = _HANDLERS.get(tool) if isinstance(tool, str) else None
+    if handler is None:
         raise PlannerError(f"Unsupported tool: {tool}")
     if not isinstance(args, dict):
         raise PlannerError("Tool args must be a JSON object")
+    return handler(args, base_dir)
 
-    if tool == "plan_task":
-        return plan_task(args, base_dir=base_dir).to_dict()
-    if tool == "plan_and_dispatch_task":
-        return plan_and_dispatch_task(
-            args,
-            base_dir=base_dir,
-            watch=bool(args.get("watch", False)),
-            poll_interval_sec=float(args.get("poll_interval_sec", 5.0)),
-        ).to_dict()
-    if tool == "dispatch_plan":
-        plan_file = args.get("planFile")
-        if not isinstance(plan_file, str) or not plan_file.strip():
-            raise PlannerError("dispatch_plan requires args.planFile")
-        return dispatch_plan(
-            Path(plan_file),
-            base_dir=base_dir,
-            watch=bool(args.get("watch", False)),
-            poll_interval_sec=float(args.get("poll_interval_sec", 5.0)),
-        ).to_dict()
-    if tool == "task_status":
-        return task_status(
-            task_id=args.get("task_id"),
-            plan_id=args.get("plan_id"),
-            base_dir=base_dir,
-        )
-    if tool == "list_plans":
-        limit = int(args.get("limit", 10))
-        return list_plans(base_dir=base_dir, limit=limit)
-    if tool == "retry_task":
-        task_id = args.get("task_id")
-        if not isinstance(task_id, str) or not task_id.strip():
-            raise PlannerError("retry_task requires args.task_id")
-        return {"task": retry_task(task_id, reason=str(args.get("reason", "")))}
-    raise PlannerError(f"Tool handler not implemented: {tool}")
+
+# 成功响应里的 governance 块是固定内容，构建一次复用即可。
+_GOVERNANCE: dict[str, Any] = {
+    "legacyCompatibility": {
+        "status": "deprecated",
+        "message": "Legacy Zoe tool API is in compatibility mode. Prefer the platform WorkItem and Console APIs.",
+        "preferredEntrypoint": "/api/work-items",
+    }
+}
 
 
 def _success(tool: str, result: dict[str, Any]) -> dict[str, Any]:
@@ -91,13 +125,7 @@ def _success(tool: str, result: dict[str, Any]) -> dict[str, Any]:
         "ok": True,
         "tool": tool,
         "result": result,
-        "governance": {
-            "legacyCompatibility": {
-                "status": "deprecated",
-                "message": "Legacy Zoe tool API is in compatibility mode. Prefer the platform WorkItem and Console APIs.",
-                "preferredEntrypoint": "/api/work-items",
-            }
-        },
+        "governance": _GOVERNANCE,
     }
 
 
@@ -128,16 +156,18 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 
 def main() -> int:
+    # schema 是无参只读命令，直接走缓存文本，跳过 argparse 子解析器构建。
+    if sys.argv[1:] == ["schema"]:
+        print(tool_contracts_json())
+        return 0
+
     parser = build_arg_parser()
     args = parser.parse_args()
-    base_dir = Path(os.getenv("AI_DEVOPS_HOME", str(Path.home() / "ai-devops")))
+    # 环境变量命中时不构造 home 兜底路径。
+    base_dir = Path(os.environ.get("AI_DEVOPS_HOME") or Path.home() / "ai-devops")
 
     if args.command == "schema":
-        payload = tool_contracts_payload()
-        if args.pretty:
-            _emit(payload)
-        else:
-            print(json.dumps(payload, ensure_ascii=False))
+        print(tool_contracts_json(pretty=args.pretty))
         return 0
 
     if args.command == "invoke":
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import json
 from typing import Any
 
+try:
+    from packages.shared.utils import json_codec
+except ImportError:  # pragma: no cover - standalone import without repo root on sys.path
+    json_codec = None
+
 
 TOOL_CONTRACTS: tuple[dict[str, Any], ...] = (
     {
@@ -171,12 +177,38 @@ TOOL_CONTRACTS: tuple[dict[str, Any], ...] = (
 )
 
 
+# TOOL_CONTRACTS 在运行期不变，名称集合与 schema payload 只需构建一次。
+TOOL_NAMES: frozenset[str] = frozenset(tool["name"] for tool in TOOL_CONTRACTS)
+
+_CONTRACTS_PAYLOAD: dict[str, Any] = {
+    "version": "1.0",
+    "tools": list(TOOL_CONTRACTS),
+}
+
+
+# 序列化结果同样不变；首次请求后缓存紧凑/缩进两种形态。
+_CONTRACTS_JSON: dict[bool, str] = {}
+
+
+def tool_contracts_json(*, pretty: bool = False) -> str:
+    cached = _CONTRACTS_JSON.get(pretty)
+    if cached is None:
+        if json_codec is not None:
+            cached = json_codec.dumps(_CONTRACTS_PAYLOAD, indent=pretty)
+        else:
+            cached = json.dumps(
+                _CONTRACTS_PAYLOAD,
+                ensure_ascii=False,
+                indent=2 if pretty else None,
+            )
+        _CONTRACTS_JSON[pretty] = cached
+    return cached
+
+
 def tool_contracts_payload() -> dict[str, Any]:
-    return {
-        "version": "1.0",
-        "tools": list(TOOL_CONTRACTS),
-    }
+    return _CONTRACTS_PAYLOAD
 
 
 def tool_names() -> set[str]:
-    return {tool["name"] for tool in TOOL_CONTRACTS}
+    # 兼容旧调用方返回可变 set；热路径直接用 TOOL_NAMES 常量做成员判断。
+    return set(TOOL_NAMES)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
+import heapq
+import os
 import re
+import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from packages.context.packer.service import ContextPackAssembler
+from packages.shared.utils import json_codec
 from packages.shared.domain.models import AuditEvent
 from packages.shared.domain.runtime_state import record_audit_event
 
@@ -36,6 +39,12 @@ RISK_PATTERNS = {
         re.IGNORECASE,
     ),
 }
+# One alternation over all risk patterns: detect_risk_flags uses it as a
+# pre-filter so the dominant clean-objective case costs a single scan.
+_COMBINED_RISK_RE = re.compile(
+    "|".join(f"({pattern.pattern})" for pattern in RISK_PATTERNS.values()),
+    re.IGNORECASE,
+)
 
 
 @dataclass(slots=True, frozen=True)
@@ -58,7 +67,8 @@ class DispatchPlanResult:
     def to_dict(self) -> dict[str, Any]:
         return {
             "planFile": str(self.plan_file),
-            "queued": [str(path) for path in self.queued_paths],
+            # os.fspath 直接取出 Path 内部字符串，map 在 C 层完成遍历。
+            "queued": list(map(os.fspath, self.queued_paths)),
             "queuedCount": len(self.queued_paths),
         }
 
@@ -73,19 +83,28 @@ class PlanAndDispatchResult:
         return {
             "plan": self.plan.to_dict(),
             "planFile": str(self.plan_path),
-            "queued": [str(path) for path in self.queued_paths],
+            "queued": list(map(os.fspath, self.queued_paths)),
             "queuedCount": len(self.queued_paths),
         }
 
 
 def generate_plan_id(repo: str, title: str, requested_at_ms: int) -> str:
-    timestamp = str(requested_at_ms)
+    # 两段各自清理后，拼接结果唯一可能的残留是截断 slug 带出的结尾 -/_，
+    # 用 rstrip 收尾即可，省掉原先对整串的第三次 sanitize 扫描。
     repo_part = sanitize_identifier(repo.replace("/", "-"))
     slug = sanitize_identifier(title.lower())[:48]
-    return sanitize_identifier(f"{timestamp}-{repo_part}-{slug}")
+    return f"{requested_at_ms}-{repo_part}-{slug}".rstrip("-_")
+
+
+def _coerce_str(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
 
 
 def detect_risk_flags(objective: str) -> list[str]:
+    # 干净 objective 只扫一遍组合正则；命中才逐条枚举——finditer 的
+    # 非重叠匹配会在模式重叠时漏报类别，逐条 search 保证结果精确。
+    if _COMBINED_RISK_RE.search(objective) is None:
+        return []
     return [name for name, pattern in RISK_PATTERNS.items() if pattern.search(objective)]
 
 
@@ -159,24 +178,28 @@ def build_plan_request(task_input: dict[str, Any], *, base_dir: Path | None = No
             "Do not dispatch allowedPaths/forbiddenPaths/mustTouch as free-form fields alone."
         )
 
-    requested_at = int(task_input.get("requested_at") or task_input.get("requestedAt") or 0)
+    # 绑定一次 .get 并跳过对已是 str 的值的 str() 重包装，
+    # 减少这条每请求必经路径上的重复哈希查找与分配。
+    get = task_input.get
+
+    requested_at = int(get("requested_at") or get("requestedAt") or 0)
     if requested_at <= 0:
         requested_at = int(time.time() * 1000)
 
-    requested_by = str(task_input.get("requested_by") or task_input.get("requestedBy") or "unknown")
-    repo = str(task_input.get("repo") or "").strip()
-    title = str(task_input.get("title") or "").strip()
-    objective = str(task_input.get("objective") or task_input.get("description") or "").strip()
+    requested_by = _coerce_str(get("requested_by") or get("requestedBy") or "unknown")
+    repo = _coerce_str(get("repo") or "").strip()
+    title = _coerce_str(get("title") or "").strip()
+    objective = _coerce_str(get("objective") or get("description") or "").strip()
     if not repo or not title or not objective:
         raise InvalidPlan("Task input must include repo, title, and description/objective")
 
-    plan_id = str(task_input.get("planId") or generate_plan_id(repo, title, requested_at))
+    plan_id = _coerce_str(get("planId") or generate_plan_id(repo, title, requested_at))
     routing = {
-        "agent": str(task_input.get("agent") or "codex").strip(),
-        "model": str(task_input.get("model") or "gpt-5.3-codex").strip(),
-        "effort": str(task_input.get("effort") or "medium").strip(),
+        "agent": _coerce_str(get("agent") or "codex").strip(),
+        "model": _coerce_str(get("model") or "gpt-5.3-codex").strip(),
+        "effort": _coerce_str(get("effort") or "medium").strip(),
     }
-    constraints = dict(task_input.get("constraints") or {})
+    constraints = dict(get("constraints") or {})
     constraints.setdefault(
         "systemPolicy",
         {
@@ -187,10 +210,11 @@ def build_plan_request(task_input: dict[str, Any], *, base_dir: Path | None = No
     )
 
     risk_flags = validate_task_policy({"objective": objective})
-    context = dict(task_input.get("context") or {})
+    context = dict(get("context") or {})
     context.setdefault("riskFlags", risk_flags)
-    if isinstance(task_input.get("taskSpec"), dict):
-        context.setdefault("taskSpec", dict(task_input["taskSpec"]))
+    task_spec = get("taskSpec")
+    if isinstance(task_spec, dict):
+        context.setdefault("taskSpec", dict(task_spec))
     _inject_success_patterns(context, repo=repo, base_dir=base_dir)
 
     return {
@@ -211,7 +235,7 @@ def build_plan_request(task_input: dict[str, Any], *, base_dir: Path | None = No
             ],
             "worktreeStrategies": ["shared", "isolated"],
         },
-        "includeFailureContext": bool(task_input.get("includeFailureContext", False)),
+        "includeFailureContext": bool(get("includeFailureContext", False)),
     }
 
 
@@ -252,13 +276,27 @@ def save_plan(plan: Plan, *, base_dir: Path | None = None) -> Path:
     return plan_path
 
 
+# 引擎无请求级可变状态，进程内复用一个默认实例即可。
+_DEFAULT_ENGINE: ZoePlannerEngine | None = None
+_DEFAULT_ENGINE_LOCK = threading.Lock()
+
+
+def _default_engine() -> ZoePlannerEngine:
+    global _DEFAULT_ENGINE
+    if _DEFAULT_ENGINE is None:
+        with _DEFAULT_ENGINE_LOCK:
+            if _DEFAULT_ENGINE is None:
+                _DEFAULT_ENGINE = ZoePlannerEngine()
+    return _DEFAULT_ENGINE
+
+
 def plan_task(
     task_input: dict[str, Any],
     *,
     engine: ZoePlannerEngine | None = None,
     base_dir: Path | None = None,
 ) -> PlanTaskResult:
-    planner = engine or ZoePlannerEngine()
+    planner = engine or _default_engine()
     session = build_work_item_session(task_input, base_dir=base_dir)
     request_payload = session.plan_request
     plan = planner.plan(request_payload)
@@ -306,10 +344,10 @@ def plan_and_dispatch_task(
 
 def read_json_file(path: Path) -> dict[str, Any]:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = json_codec.loads(path.read_bytes())
     except FileNotFoundError as exc:
         raise InvalidPlan(f"Task file not found: {path}") from exc
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:
         raise InvalidPlan(f"Task file is not valid JSON: {path}") from exc
     if not isinstance(payload, dict):
         raise InvalidPlan("Task file must contain a JSON object")
@@ -400,20 +438,27 @@ def retry_task(
 
 
 def list_plans(*, base_dir: Path | None = None, limit: int = 10) -> dict[str, Any]:
-    root = tasks_dir(base_dir)
-    if not root.exists():
+    # 全程走 os.path 字符串路径：DirEntry.is_dir 复用 readdir 带回的 d_type，
+    # 不再为每个条目分配 Path 对象或补一次 stat。
+    root = os.fspath(tasks_dir(base_dir))
+    # 目录名以时间戳开头，名称降序即时间降序；heapq.nlargest 只保留 top-k，
+    # 避免对整个 tasks 目录做 O(N log N) 排序。多取一倍以容忍缺 plan.json 的目录。
+    try:
+        with os.scandir(root) as it:
+            candidates = heapq.nlargest(
+                max(limit * 2, limit),
+                (entry.name for entry in it if entry.is_dir(follow_symlinks=False)),
+            )
+    except FileNotFoundError:
         return {"plans": []}
 
     entries: list[dict[str, Any]] = []
-    for path in sorted(root.iterdir(), reverse=True):
-        if not path.is_dir():
-            continue
-        plan_file = path / "plan.json"
-        if not plan_file.exists():
-            continue
+    for name in candidates:
+        plan_file = os.path.join(root, name, "plan.json")
         try:
-            payload = json.loads(plan_file.read_text(encoding="utf-8"))
-        except json.JSONDecodeError:
+            with open(plan_file, "rb") as fh:
+                payload = json_codec.loads(fh.read())
+        except (FileNotFoundError, ValueError):
             continue
         if not isinstance(payload, dict):
             continue
@@ -425,7 +470,7 @@ def list_plans(*, base_dir: Path | None = None, limit: int = 10) -> dict[str, An
                 "requestedBy": payload.get("requestedBy"),
                 "requestedAt": payload.get("requestedAt"),
                 "subtaskCount": len(payload.get("subtasks") or []),
-                "planFile": str(plan_file),
+                "planFile": plan_file,
             }
         )
         if len(entries) >= limit:
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import json
+import os
 import time
 from pathlib import Path
 from typing import Any, Callable
 
+from packages.shared.utils import json_codec
+
 
 @dataclass(slots=True, frozen=True)
 class PreparedWorkspace:
@@ -29,10 +32,17 @@ class QueueConsumer:
         self.queue_dir = queue_dir
 
     def list_queue_files(self) -> list[Path]:
-        return sorted(self.queue_dir.glob("*.json"))
+        # os.scandir skips the per-entry stat and fnmatch overhead of glob;
+        # the name sort keeps the FIFO ordering callers rely on.
+        try:
+            with os.scandir(self.queue_dir) as it:
+                names = sorted(e.name for e in it if e.name.endswith(".json") and e.is_file())
+        except FileNotFoundError:
+            return []
+        return [self.queue_dir / name for name in names]
 
     def load_task(self, queue_file: Path) -> dict[str, Any]:
-        payload = json.loads(queue_file.read_text(encoding="utf-8"))
+        payload = json_codec.loads(queue_file.read_bytes())
         if not isinstance(payload, dict):
             raise RuntimeError(f"Invalid queue payload: {queue_file}")
         return payload
@@ -59,8 +69,12 @@ class WorkspaceManager:
         prompt_file = worktree / "prompt.txt"
         prompt_file.write_text(str(task.get("prompt") or ""), encoding="utf-8")
 
-        metadata = task.get("metadata") if isinstance(task.get("metadata"), dict) else {}
-        task_spec_payload = metadata.get("taskSpec") if isinstance(metadata.get("taskSpec"), dict) else None
+        metadata = task.get("metadata")
+        if not isinstance(metadata, dict):
+            metadata = {}
+        task_spec_payload = metadata.get("taskSpec")
+        if not isinstance(task_spec_payload, dict):
+            task_spec_payload = None
         task_spec_file: Path | None = None
         scope_manifest_file: Path | None = None
         sparse_checkout_applied = False
@@ -148,7 +162,9 @@ class RunStateRecorder:
         model: str,
         effort: str,
     ) -> dict[str, Any]:
-        metadata = task.get("metadata", {}) if isinstance(task.get("metadata"), dict) else {}
+        metadata = task.get("metadata")
+        if not isinstance(metadata, dict):
+            metadata = {}
         return {
             "id": task["id"],
             "repo": task["repo"],
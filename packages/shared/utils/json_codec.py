@@ -0,0 +1,44 @@
+"""JSON encode/decode helpers that prefer orjson when it is installed.
+
+Queue files, plan files, and task payloads are parsed on every daemon tick,
+so the hot paths route through these helpers instead of calling stdlib
+``json`` directly. orjson decodes/encodes in C; when it is unavailable the
+helpers fall back to the stdlib with equivalent output.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str.
+
+    Raises ``json.JSONDecodeError`` (orjson's decode error subclasses it) on
+    invalid input, so existing except clauses keep working.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> str:
+    """Encode ``obj`` to a JSON string without ASCII-escaping."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode ``obj`` to UTF-8 JSON bytes, skipping the str round-trip."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
@@ -1,6 +1,6 @@
 #!/bin/bash
 # Test runner for AI DevOps
-# Usage: ./scripts/test.sh [--coverage] [--watch] [--specific-test]
+# Usage: ./scripts/test.sh [--coverage] [--watch] [--parallel] [--specific-test]
 
 set -e
 
@@ -32,6 +32,7 @@ cd "$BASE_DIR"
 # Parse arguments
 COVERAGE=false
 WATCH=false
+PARALLEL=false
 SPECIFIC_TEST=""
 
 while [[ $# -gt 0 ]]; do
@@ -44,6 +45,10 @@ while [[ $# -gt 0 ]]; do
             WATCH=true
             shift
             ;;
+        --parallel|-p)
+            PARALLEL=true
+            shift
+            ;;
         --test|-t)
             SPECIFIC_TEST="$2"
             shift 2
@@ -54,6 +59,7 @@ while [[ $# -gt 0 ]]; do
             echo "Options:"
             echo "  --coverage, -c    Run with coverage report"
             echo "  --watch, -w       Watch mode (re-run on changes)"
+            echo "  --parallel, -p    Run tests across all CPU cores (pytest-xdist)"
             echo "  --test, -t        Run specific test (e.g., tests/test_db.py::TestClass)"
             echo "  --help, -h        Show this help"
             exit 0
@@ -76,6 +82,11 @@ if [ "$COVERAGE" = true ]; then
     PYTEST_CMD="$PYTEST_CMD --cov=orchestrator/bin --cov-report=term-missing --cov-report=html:cov_html"
 fi
 
+if [ "$PARALLEL" = true ]; then
+    pip install pytest-xdist -q
+    PYTEST_CMD="$PYTEST_CMD -n auto"
+fi
+
 if [ "$WATCH" = true ]; then
     pip install pytest-watch -q
     PYTEST_CMD="ptw -- $PYTEST_CMD"
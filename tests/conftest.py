@@ -0,0 +1,44 @@
+"""Shared fixtures for the orchestrator test suite."""
+import gc
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+
+@contextmanager
+def _gc_paused():
+    """建树期间暂停分代回收：脚手架对象全是即弃的，没必要触发年轻代收集。"""
+    was_enabled = gc.isenabled()
+    if was_enabled:
+        gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+@pytest.fixture
+def demo_repo_builder(tmp_path, monkeypatch):
+    """构建 ai-devops/repos/<repo> 测试树并把 AI_DEVOPS_HOME 指向它的工厂。
+
+    接收 {相对路径: 文件内容} 映射，一次性创建目录与文件，替代各测试里
+    重复的 mkdir + write_text 样板；返回 (base, repo_root)。内容可直接
+    给预编码的 bytes，跳过每次 write_text 的 UTF-8 编码与 TextIOWrapper。
+    """
+
+    def build(files: dict[str, str | bytes], *, repo: str = "demo-repo") -> tuple[Path, Path]:
+        base = tmp_path / "ai-devops"
+        repo_root = base / "repos" / repo
+        with _gc_paused():
+            targets = {rel: repo_root / rel for rel in files}
+            # 同目录多文件只建一次目录，少走重复的 stat/mkdir 链。
+            for parent in {target.parent for target in targets.values()}:
+                parent.mkdir(parents=True, exist_ok=True)
+            for rel, content in files.items():
+                targets[rel].write_bytes(content if isinstance(content, bytes) else content.encode("utf-8"))
+        monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
+        return base, repo_root
+
+    return build
@@ -316,7 +316,7 @@ class TestDAGRendererFileOutput:
             graph = DAGGraph(nodes=nodes, edges=[])
             
             result = renderer.render_dag_json(graph)
-            output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+            output_path.write_text(json.dumps(result, separators=(",", ":")), encoding="utf-8")
             
             assert output_path.exists()
             loaded = json.loads(output_path.read_text(encoding="utf-8"))
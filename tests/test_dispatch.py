@@ -3,6 +3,7 @@
 Tests for dispatch.py - Fixed Version
 """
 
+import copy
 import json
 import os
 import tempfile
@@ -22,29 +23,33 @@ from orchestrator.bin.errors import DispatchError
 from orchestrator.bin.plan_schema import Plan, Subtask
 
 
+# 基准 payload 只在模块加载时求值一次；make_plan 按测试深拷贝后再套 overrides。
+_PLAN_PAYLOAD = {
+    "planId": "test-plan",
+    "repo": "test/repo",
+    "title": "Test",
+    "requestedBy": "user",
+    "requestedAt": 1234567890,
+    "objective": "Test objective",
+    "routing": {"agent": "codex", "model": "gpt-5", "effort": "medium"},
+    "version": "1.0",
+    "subtasks": [
+        {
+            "id": "S1",
+            "title": "Subtask 1",
+            "description": "Test description",
+            "worktreeStrategy": "isolated",
+            "dependsOn": [],
+            "filesHint": [],
+            "prompt": "Test prompt",
+        },
+    ],
+}
+
+
 def make_plan(**overrides) -> Plan:
     """Helper to create valid Plan"""
-    payload = {
-        "planId": "test-plan",
-        "repo": "test/repo",
-        "title": "Test",
-        "requestedBy": "user",
-        "requestedAt": 1234567890,
-        "objective": "Test objective",
-        "routing": {"agent": "codex", "model": "gpt-5", "effort": "medium"},
-        "version": "1.0",
-        "subtasks": [
-            {
-                "id": "S1",
-                "title": "Subtask 1",
-                "description": "Test description",
-                "worktreeStrategy": "isolated",
-                "dependsOn": [],
-                "filesHint": [],
-                "prompt": "Test prompt",
-            },
-        ],
-    }
+    payload = copy.deepcopy(_PLAN_PAYLOAD)
     if "subtasks" in overrides:
         for st in overrides["subtasks"]:
             if "worktreeStrategy" not in st:
@@ -410,7 +415,7 @@ class TestDispatchPlanFileHardening(unittest.TestCase):
         archived_root = self.base / "tasks" / archived.plan_id
         archived_root.mkdir(parents=True, exist_ok=True)
         (archived_root / "plan.json").write_text(
-            json.dumps(archived.to_dict(), ensure_ascii=False, indent=2),
+            json.dumps(archived.to_dict(), ensure_ascii=False, separators=(",", ":")),
             encoding="utf-8",
         )
 
@@ -418,7 +423,7 @@ class TestDispatchPlanFileHardening(unittest.TestCase):
         incoming = make_plan(title="New title")
         incoming_path = self.plan_dir / "incoming.json"
         incoming_path.write_text(
-            json.dumps(incoming.to_dict(), ensure_ascii=False, indent=2),
+            json.dumps(incoming.to_dict(), ensure_ascii=False, separators=(",", ":")),
             encoding="utf-8",
         )
 
@@ -1,48 +1,70 @@
+import copy
+import re
+
 import pytest
 
 from orchestrator.bin.errors import InvalidPlan
 from orchestrator.bin.plan_schema import PROMPT_MAX_CHARS, Plan, Subtask, TaskType
 
 
-def make_plan_payload() -> dict:
-    return {
-        "planId": "1730000000000-demo-repo-fix-login",
-        "repo": "demo/repo",
-        "title": "Fix login flow",
-        "requestedBy": "alice#1234",
-        "requestedAt": 1730000000000,
-        "objective": "Fix the login flow and add coverage.",
-        "constraints": {"doNotTouch": ["infra/"]},
-        "context": {"notes": ["AUTH-12"]},
-        "routing": {
-            "agent": "codex",
-            "model": "gpt-5.3-codex",
-            "effort": "medium",
+# 基准 payload 模块级只构建一次；make_plan_payload 深拷贝供各测试独立修改。
+_BASE_PLAN_PAYLOAD = {
+    "planId": "1730000000000-demo-repo-fix-login",
+    "repo": "demo/repo",
+    "title": "Fix login flow",
+    "requestedBy": "alice#1234",
+    "requestedAt": 1730000000000,
+    "objective": "Fix the login flow and add coverage.",
+    "constraints": {"doNotTouch": ["infra/"]},
+    "context": {"notes": ["AUTH-12"]},
+    "routing": {
+        "agent": "codex",
+        "model": "gpt-5.3-codex",
+        "effort": "medium",
+    },
+    "version": "1.0",
+    "subtasks": [
+        {
+            "id": "S1",
+            "title": "Investigate auth regression",
+            "description": "Inspect the login path and identify the failing branch.",
+            "worktreeStrategy": "isolated",
+            "dependsOn": [],
+            "filesHint": ["app/auth.py"],
+            "prompt": "DoD: identify the failing path and patch it.\nBoundary: do not touch infra/.",
+            "definitionOfDone": ["Login succeeds for valid credentials."],
         },
-        "version": "1.0",
-        "subtasks": [
-            {
-                "id": "S1",
-                "title": "Investigate auth regression",
-                "description": "Inspect the login path and identify the failing branch.",
-                "worktreeStrategy": "isolated",
-                "dependsOn": [],
-                "filesHint": ["app/auth.py"],
-                "prompt": "DoD: identify the failing path and patch it.\nBoundary: do not touch infra/.",
-                "definitionOfDone": ["Login succeeds for valid credentials."],
-            },
-            {
-                "id": "S2",
-                "title": "Add regression test",
-                "description": "Add a focused unit test for the failing login case.",
-                "worktreeStrategy": "isolated",
-                "dependsOn": ["S1"],
-                "filesHint": ["tests/test_auth.py"],
-                "prompt": "DoD: add regression coverage.\nBoundary: keep the change scoped to auth tests.",
-                "definitionOfDone": ["Regression test fails before the fix and passes after."],
-            },
-        ],
-    }
+        {
+            "id": "S2",
+            "title": "Add regression test",
+            "description": "Add a focused unit test for the failing login case.",
+            "worktreeStrategy": "isolated",
+            "dependsOn": ["S1"],
+            "filesHint": ["tests/test_auth.py"],
+            "prompt": "DoD: add regression coverage.\nBoundary: keep the change scoped to auth tests.",
+            "definitionOfDone": ["Regression test fails before the fix and passes after."],
+        },
+    ],
+}
+
+
+def make_plan_payload() -> dict:
+    return copy.deepcopy(_BASE_PLAN_PAYLOAD)
+
+
+# 失败用例的 match 模式预编译一次，也顺带固化这些错误信息不变式。
+_UNKNOWN_SUBTASK_RE = re.compile("unknown subtask")
+_CYCLE_RE = re.compile("cycle")
+_PROMPT_TOO_LONG_RE = re.compile("Prompt too long")
+
+
+def _is_topo(order: list[str], edges: list[tuple[str, str]]) -> bool:
+    """每条依赖边 u -> v 在排序里都满足 u 在 v 之前。
+
+    只断言结构不变式而非具体顺序，给排序实现（Kahn / DFS）留出余地。
+    """
+    pos = {node: index for index, node in enumerate(order)}
+    return all(pos[u] < pos[v] for u, v in edges)
 
 
 def test_valid_plan_passes() -> None:
@@ -51,14 +73,16 @@ def test_valid_plan_passes() -> None:
     assert plan.plan_id == "1730000000000-demo-repo-fix-login"
     assert [subtask.agent for subtask in plan.subtasks] == ["codex", "codex"]
     assert [subtask.model for subtask in plan.subtasks] == ["gpt-5.3-codex", "gpt-5.3-codex"]
-    assert [subtask.id for subtask in plan.topologically_sorted_subtasks()] == ["S1", "S2"]
+    order = [subtask.id for subtask in plan.topologically_sorted_subtasks()]
+    assert sorted(order) == ["S1", "S2"]
+    assert _is_topo(order, [("S1", "S2")])
 
 
 def test_depends_on_unknown_subtask_fails() -> None:
     payload = make_plan_payload()
     payload["subtasks"][1]["dependsOn"] = ["S9"]
 
-    with pytest.raises(InvalidPlan, match="unknown subtask"):
+    with pytest.raises(InvalidPlan, match=_UNKNOWN_SUBTASK_RE):
         Plan.from_dict(payload)
 
 
@@ -66,7 +90,7 @@ def test_depends_on_cycle_fails() -> None:
     payload = make_plan_payload()
     payload["subtasks"][0]["dependsOn"] = ["S2"]
 
-    with pytest.raises(InvalidPlan, match="cycle"):
+    with pytest.raises(InvalidPlan, match=_CYCLE_RE):
         Plan.from_dict(payload)
 
 
@@ -74,7 +98,7 @@ def test_prompt_limit_fails() -> None:
     payload = make_plan_payload()
     payload["subtasks"][0]["prompt"] = "x" * (PROMPT_MAX_CHARS + 1)
 
-    with pytest.raises(InvalidPlan, match="Prompt too long"):
+    with pytest.raises(InvalidPlan, match=_PROMPT_TOO_LONG_RE):
         Plan.from_dict(payload)
 
 
@@ -1,88 +1,123 @@
+import copy
+
+import pytest
+
 from orchestrator.bin.planner_engine import ZoePlannerEngine
 
+# 引擎无可变状态，整个模块复用一个实例即可。
+_ENGINE = ZoePlannerEngine()
+
+
+# 基准 task_input 只在模块加载时构建；make_task_input 深拷贝后套用 overrides。
+_BASE_TASK_INPUT: dict[str, object] = {
+    "planId": "1730000000000-agent-mission-control-refactor-auth-flow",
+    "repo": "agent-mission-control",
+    "title": "Refactor auth flow and update docs",
+    "requestedBy": "alice#1234",
+    "requestedAt": 1730000000000,
+    "objective": (
+        "Refactor the auth flow, wire the new session helper through the API layer, "
+        "add regression coverage, and update the operator documentation."
+    ),
+    "constraints": {
+        "definitionOfDone": ["Keep the auth behavior backward compatible."],
+    },
+    "context": {
+        "filesHint": [
+            "src/auth/session.py",
+            "src/api/routes/auth.py",
+            "tests/test_auth_flow.py",
+            "README.md",
+        ]
+    },
+    "routing": {
+        "agent": "codex",
+        "model": "gpt-5.3-codex",
+        "effort": "high",
+    },
+    "version": "1.0",
+}
+
 
 def make_task_input(**overrides: object) -> dict[str, object]:
-    payload: dict[str, object] = {
-        "planId": "1730000000000-agent-mission-control-refactor-auth-flow",
-        "repo": "agent-mission-control",
-        "title": "Refactor auth flow and update docs",
-        "requestedBy": "alice#1234",
-        "requestedAt": 1730000000000,
-        "objective": (
-            "Refactor the auth flow, wire the new session helper through the API layer, "
-            "add regression coverage, and update the operator documentation."
-        ),
-        "constraints": {
-            "definitionOfDone": ["Keep the auth behavior backward compatible."],
+    payload = copy.deepcopy(_BASE_TASK_INPUT)
+    payload.update(overrides)
+    return payload
+
+
+# simple / complex 两条路径共用同一套断言流程，仅期望数据不同，
+# 与下方 _DISCOVERY_CASES 的组织方式保持一致。
+_PLAN_SHAPE_CASES = [
+    pytest.param(
+        {},
+        {
+            "ids": ["S1", "S2", "S3", "S4"],
+            "titles": [
+                "Prepare the implementation surface",
+                "Land the primary implementation",
+                "Add validation and regression coverage",
+                "Update documentation and handoff notes",
+            ],
+            "depends_on": [(), ("S1",), ("S2",), ("S3",)],
+            "files_eq": {
+                0: ("src/auth/session.py", "src/api/routes/auth.py"),
+                1: ("src/api/routes/auth.py", "src/auth/session.py"),
+                3: ("README.md",),
+            },
+            "files_first": {2: "tests/test_auth_flow.py"},
+            "files_contain": {2: ["src/auth/session.py"]},
+            "planner": {"strategy": "phased-v1", "subtaskCount": 4},
         },
-        "context": {
-            "filesHint": [
-                "src/auth/session.py",
-                "src/api/routes/auth.py",
-                "tests/test_auth_flow.py",
-                "README.md",
-            ]
+        id="complex-four-phases",
+    ),
+    pytest.param(
+        {
+            "title": "Fix login timeout",
+            "objective": "Fix the login timeout handling for expired sessions.",
+            "context": {"filesHint": ["src/auth/session.py", "tests/test_session_timeout.py"]},
         },
-        "routing": {
-            "agent": "codex",
-            "model": "gpt-5.3-codex",
-            "effort": "high",
+        {
+            "ids": ["S1", "S2"],
+            "titles": [
+                "Land the primary implementation",
+                "Add validation and regression coverage",
+            ],
+            "depends_on": [(), ("S1",)],
+            "files_eq": {0: ("src/auth/session.py",)},
+            "files_first": {1: "tests/test_session_timeout.py"},
+            "files_contain": {1: ["src/auth/session.py"]},
+            "planner": {},
         },
-        "version": "1.0",
-    }
-    payload.update(overrides)
-    return payload
+        id="simple-impl-and-validation",
+    ),
+]
 
 
-def test_complex_code_task_splits_into_multiple_ordered_subtasks() -> None:
-    plan = ZoePlannerEngine().plan(make_task_input())
-
-    assert [subtask.id for subtask in plan.subtasks] == ["S1", "S2", "S3", "S4"]
-    assert [subtask.title for subtask in plan.subtasks] == [
-        "Prepare the implementation surface",
-        "Land the primary implementation",
-        "Add validation and regression coverage",
-        "Update documentation and handoff notes",
-    ]
-    assert [subtask.depends_on for subtask in plan.subtasks] == [
-        (),
-        ("S1",),
-        ("S2",),
-        ("S3",),
-    ]
+def _assert_plan_shape(plan, expected: dict) -> None:
+    assert [subtask.id for subtask in plan.subtasks] == expected["ids"]
+    assert [subtask.title for subtask in plan.subtasks] == expected["titles"]
+    assert [subtask.depends_on for subtask in plan.subtasks] == expected["depends_on"]
     assert all(subtask.worktree_strategy == "shared" for subtask in plan.subtasks)
-    assert plan.subtasks[0].files_hint == ("src/auth/session.py", "src/api/routes/auth.py")
-    assert plan.subtasks[1].files_hint == ("src/api/routes/auth.py", "src/auth/session.py")
-    assert plan.subtasks[2].files_hint[0] == "tests/test_auth_flow.py"
-    assert "src/auth/session.py" in plan.subtasks[2].files_hint
-    assert plan.subtasks[3].files_hint == ("README.md",)
-    assert plan.context["planner"]["strategy"] == "phased-v1"
-    assert plan.context["planner"]["subtaskCount"] == 4
+    for index, files in expected["files_eq"].items():
+        assert plan.subtasks[index].files_hint == files
+    for index, path in expected["files_first"].items():
+        assert plan.subtasks[index].files_hint[0] == path
+    for index, paths in expected["files_contain"].items():
+        for path in paths:
+            assert path in plan.subtasks[index].files_hint
+    for key, value in expected["planner"].items():
+        assert plan.context["planner"][key] == value
 
 
-def test_simple_code_task_still_generates_implementation_and_validation() -> None:
-    plan = ZoePlannerEngine().plan(
-        make_task_input(
-            title="Fix login timeout",
-            objective="Fix the login timeout handling for expired sessions.",
-            context={"filesHint": ["src/auth/session.py", "tests/test_session_timeout.py"]},
-        )
-    )
+@pytest.mark.parametrize("overrides,expected", _PLAN_SHAPE_CASES)
+def test_code_task_plan_shape(overrides, expected) -> None:
+    plan = _ENGINE.plan(make_task_input(**overrides))
 
-    assert [subtask.id for subtask in plan.subtasks] == ["S1", "S2"]
-    assert [subtask.title for subtask in plan.subtasks] == [
-        "Land the primary implementation",
-        "Add validation and regression coverage",
-    ]
-    assert plan.subtasks[1].depends_on == ("S1",)
-    assert all(subtask.worktree_strategy == "shared" for subtask in plan.subtasks)
-    assert plan.subtasks[0].files_hint == ("src/auth/session.py",)
-    assert plan.subtasks[1].files_hint[0] == "tests/test_session_timeout.py"
-    assert "src/auth/session.py" in plan.subtasks[1].files_hint
+    _assert_plan_shape(plan, expected)
 
 
 def test_analysis_task_is_not_misclassified_as_docs_only() -> None:
-    plan = ZoePlannerEngine().plan(
+    plan = _ENGINE.plan(
         make_task_input(
             title="检查开发进度",
             objective="阅读项目代码和文档，确认当前开发进度",
@@ -98,53 +133,107 @@ def test_analysis_task_is_not_misclassified_as_docs_only() -> None:
     assert plan.context["planner"]["docsOnly"] is False
 
 
-def test_analysis_task_discovers_repo_entry_files_when_no_files_hint(tmp_path, monkeypatch) -> None:
-    base = tmp_path / "ai-devops"
-    repo_root = base / "repos" / "demo-repo"
-    (repo_root / "src").mkdir(parents=True)
-    (repo_root / "scripts").mkdir(parents=True)
-    (repo_root / "README.md").write_text("demo", encoding="utf-8")
-    (repo_root / "package.json").write_text("{}", encoding="utf-8")
-    (repo_root / "src" / "main.ts").write_text("export {};\n", encoding="utf-8")
-    (repo_root / "scripts" / "worker.ts").write_text("console.log('ok')\n", encoding="utf-8")
-    monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
+def _discovery_payload(plan_id: str, title: str, objective: str) -> dict[str, object]:
+    return {
+        "planId": plan_id,
+        "repo": "demo-repo",
+        "title": title,
+        "requestedBy": "alice#1234",
+        "requestedAt": 1730000000000,
+        "objective": objective,
+        "constraints": {},
+        "context": {},
+        "routing": {
+            "agent": "codex",
+            "model": "gpt-5.3-codex",
+            "effort": "medium",
+        },
+        "version": "1.0",
+    }
+
 
-    plan = ZoePlannerEngine().plan(
+# 无 filesHint 时的仓库文件发现：analysis / code 两条路径共享同一套
+# 建树与断言流程，仅数据不同。
+_DISCOVERY_CASES = [
+    pytest.param(
         {
-            "planId": "1730000000000-demo-repo-check-status",
-            "repo": "demo-repo",
-            "title": "检查进度",
-            "requestedBy": "alice#1234",
-            "requestedAt": 1730000000000,
-            "objective": "阅读当前代码和文档，确认当前开发进度。",
-            "constraints": {},
-            "context": {},
-            "routing": {
-                "agent": "codex",
-                "model": "gpt-5.3-codex",
-                "effort": "medium",
-            },
-            "version": "1.0",
+            "README.md": b"demo",
+            "package.json": b"{}",
+            "src/main.ts": b"export {};\n",
+            "scripts/worker.ts": b"console.log('ok')\n",
+        },
+        _discovery_payload(
+            "1730000000000-demo-repo-check-status",
+            "检查进度",
+            "阅读当前代码和文档，确认当前开发进度。",
+        ),
+        ["Analyze the current state"],
+        {0: ["README.md", "package.json", "src/main.ts"]},
+        {},
+        {},
+        id="analysis-entry-files",
+    ),
+    pytest.param(
+        {
+            "package.json": b"{}",
+            "src/auth/session.ts": b"export const session = {};\n",
+            "src/auth/routes.ts": b"export const routes = {};\n",
+            "tests/test_auth.ts": b"console.log('test')\n",
+        },
+        _discovery_payload(
+            "1730000000000-demo-repo-fix-auth",
+            "修复现存错误",
+            "运行当前代码，修复存在的错误",
+        ),
+        [
+            "Land the primary implementation",
+            "Add validation and regression coverage",
+        ],
+        {0: ["src/auth/session.ts", "src/auth/routes.ts"]},
+        {1: "tests/test_auth.ts"},
+        {1: ["src/auth/session.ts", "src/auth/routes.ts"]},
+        id="code-impl-and-tests",
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "files,payload,expected_titles,required_files,first_file,any_of_files",
+    _DISCOVERY_CASES,
+)
+def test_task_discovers_repo_files_when_no_files_hint(
+    demo_repo_builder,
+    files,
+    payload,
+    expected_titles,
+    required_files,
+    first_file,
+    any_of_files,
+) -> None:
+    demo_repo_builder(files)
+
+    plan = _ENGINE.plan(payload)
+
+    assert [subtask.title for subtask in plan.subtasks] == expected_titles
+    for index, paths in required_files.items():
+        for path in paths:
+            assert path in plan.subtasks[index].files_hint
+    for index, path in first_file.items():
+        assert plan.subtasks[index].files_hint[0] == path
+    for index, paths in any_of_files.items():
+        assert any(path in plan.subtasks[index].files_hint for path in paths)
+
+
+def test_constraint_paths_override_repo_discovery_and_harden_prompt(demo_repo_builder) -> None:
+    _, repo_root = demo_repo_builder(
+        {
+            "src/background.js": b"console.log('bg')\n",
+            "skills/sonos-pure-play/scripts/query-planner.mjs": b"export const qp = {};\n",
+            "skills/sonos-pure-play/scripts/web-flow.mjs": b"export const wf = {};\n",
         }
     )
 
-    assert plan.subtasks[0].title == "Analyze the current state"
-    assert "README.md" in plan.subtasks[0].files_hint
-    assert "package.json" in plan.subtasks[0].files_hint
-    assert "src/main.ts" in plan.subtasks[0].files_hint
-
-
-def test_constraint_paths_override_repo_discovery_and_harden_prompt(tmp_path, monkeypatch) -> None:
-    base = tmp_path / "ai-devops"
-    repo_root = base / "repos" / "demo-repo"
-    (repo_root / "src").mkdir(parents=True)
-    (repo_root / "skills" / "sonos-pure-play" / "scripts").mkdir(parents=True)
-    (repo_root / "src" / "background.js").write_text("console.log('bg')\n", encoding="utf-8")
-    (repo_root / "skills" / "sonos-pure-play" / "scripts" / "query-planner.mjs").write_text("export const qp = {};\n", encoding="utf-8")
-    (repo_root / "skills" / "sonos-pure-play" / "scripts" / "web-flow.mjs").write_text("export const wf = {};\n", encoding="utf-8")
-    monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
-
-    plan = ZoePlannerEngine().plan(
+    plan = _ENGINE.plan(
         {
             "planId": "1730000000000-demo-repo-sonos-fix",
             "repo": "demo-repo",
@@ -177,19 +266,17 @@ def test_constraint_paths_override_repo_discovery_and_harden_prompt(tmp_path, mo
     assert "TASK_SPEC (machine contract):" in plan.subtasks[0].prompt
 
 
-def test_constraint_scoped_task_keeps_validation_and_docs_inside_scope(tmp_path, monkeypatch) -> None:
-    base = tmp_path / "ai-devops"
-    repo_root = base / "repos" / "demo-repo"
-    (repo_root / "skills" / "sonos-pure-play" / "scripts").mkdir(parents=True)
-    (repo_root / "tests").mkdir(parents=True)
-    (repo_root / "docs").mkdir(parents=True)
-    (repo_root / "skills" / "sonos-pure-play" / "scripts" / "query-planner.mjs").write_text("export const qp = {};\n", encoding="utf-8")
-    (repo_root / "skills" / "sonos-pure-play" / "scripts" / "executor.mjs").write_text("export const ex = {};\n", encoding="utf-8")
-    (repo_root / "tests" / "test_unrelated.py").write_text("def test_unrelated():\n    pass\n", encoding="utf-8")
-    (repo_root / "docs" / "unrelated.md").write_text("# unrelated\n", encoding="utf-8")
-    monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
+def test_constraint_scoped_task_keeps_validation_and_docs_inside_scope(demo_repo_builder) -> None:
+    _, repo_root = demo_repo_builder(
+        {
+            "skills/sonos-pure-play/scripts/query-planner.mjs": b"export const qp = {};\n",
+            "skills/sonos-pure-play/scripts/executor.mjs": b"export const ex = {};\n",
+            "tests/test_unrelated.py": b"def test_unrelated():\n    pass\n",
+            "docs/unrelated.md": b"# unrelated\n",
+        }
+    )
 
-    plan = ZoePlannerEngine().plan(
+    plan = _ENGINE.plan(
         {
             "planId": "1730000000000-demo-repo-sonos-repair",
             "repo": "demo-repo",
@@ -218,43 +305,3 @@ def test_constraint_scoped_task_keeps_validation_and_docs_inside_scope(tmp_path,
         assert all(path.startswith("skills/sonos-pure-play") for path in subtask.files_hint)
         assert "tests/test_unrelated.py" not in subtask.files_hint
         assert "docs/unrelated.md" not in subtask.files_hint
-
-
-def test_code_task_discovers_implementation_and_test_files_when_no_files_hint(tmp_path, monkeypatch) -> None:
-    base = tmp_path / "ai-devops"
-    repo_root = base / "repos" / "demo-repo"
-    (repo_root / "src" / "auth").mkdir(parents=True)
-    (repo_root / "tests").mkdir(parents=True)
-    (repo_root / "package.json").write_text("{}", encoding="utf-8")
-    (repo_root / "src" / "auth" / "session.ts").write_text("export const session = {};\n", encoding="utf-8")
-    (repo_root / "src" / "auth" / "routes.ts").write_text("export const routes = {};\n", encoding="utf-8")
-    (repo_root / "tests" / "test_auth.ts").write_text("console.log('test')\n", encoding="utf-8")
-    monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
-
-    plan = ZoePlannerEngine().plan(
-        {
-            "planId": "1730000000000-demo-repo-fix-auth",
-            "repo": "demo-repo",
-            "title": "修复现存错误",
-            "requestedBy": "alice#1234",
-            "requestedAt": 1730000000000,
-            "objective": "运行当前代码，修复存在的错误",
-            "constraints": {},
-            "context": {},
-            "routing": {
-                "agent": "codex",
-                "model": "gpt-5.3-codex",
-                "effort": "medium",
-            },
-            "version": "1.0",
-        }
-    )
-
-    assert [subtask.title for subtask in plan.subtasks] == [
-        "Land the primary implementation",
-        "Add validation and regression coverage",
-    ]
-    assert "src/auth/session.ts" in plan.subtasks[0].files_hint
-    assert "src/auth/routes.ts" in plan.subtasks[0].files_hint
-    assert plan.subtasks[1].files_hint[0] == "tests/test_auth.ts"
-    assert "src/auth/session.ts" in plan.subtasks[1].files_hint or "src/auth/routes.ts" in plan.subtasks[1].files_hint
@@ -3,7 +3,13 @@ import os
 
 import pytest
 
-from orchestrator.bin.zoe_tools import build_plan_request, list_plans, plan_and_dispatch_task, task_status
+from orchestrator.bin.zoe_tools import (
+    build_plan_request,
+    detect_risk_flags,
+    list_plans,
+    plan_and_dispatch_task,
+    task_status,
+)
 from orchestrator.bin.db import init_db, insert_task
 from orchestrator.bin.errors import DispatchError, InvalidPlan
 
@@ -21,15 +27,14 @@ def make_task_input() -> dict[str, object]:
     }
 
 
-def test_plan_and_dispatch_task_archives_plan_and_queues_first_subtask(tmp_path, monkeypatch) -> None:
-    base = tmp_path / "ai-devops"
-    repo_root = base / "repos" / "demo-repo"
-    (repo_root / "src" / "auth").mkdir(parents=True)
-    (repo_root / "tests").mkdir(parents=True)
-    (repo_root / ".git").write_text("gitdir: /tmp/demo-repo.git\n", encoding="utf-8")
-    (repo_root / "src" / "auth" / "session.ts").write_text("export const session = {};\n", encoding="utf-8")
-    (repo_root / "tests" / "test_auth.ts").write_text("console.log('test')\n", encoding="utf-8")
-    monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
+def test_plan_and_dispatch_task_archives_plan_and_queues_first_subtask(demo_repo_builder, monkeypatch) -> None:
+    base, _ = demo_repo_builder(
+        {
+            ".git": b"gitdir: /tmp/demo-repo.git\n",
+            "src/auth/session.ts": b"export const session = {};\n",
+            "tests/test_auth.ts": b"console.log('test')\n",
+        }
+    )
     monkeypatch.setattr("orchestrator.bin.dispatch._daemon_running", lambda: True)
 
     result = plan_and_dispatch_task(make_task_input(), base_dir=base)
@@ -63,43 +68,44 @@ def test_plan_and_dispatch_task_requires_repo_checkout(tmp_path, monkeypatch) ->
         plan_and_dispatch_task(make_task_input(), base_dir=base)
 
 
+# plan.json fixture 内容不变，序列化一次复用（紧凑格式，文件只被机器读）。
+_PLAN_JSON = json.dumps(
+    {
+        "planId": "1730000000000-demo-repo-fix-auth",
+        "repo": "demo-repo",
+        "title": "Fix auth flow",
+        "requestedBy": "alice#1234",
+        "requestedAt": 1730000000000,
+        "objective": "Fix auth flow",
+        "constraints": {},
+        "context": {},
+        "routing": {"agent": "codex", "model": "gpt-5.3-codex", "effort": "high"},
+        "version": "1.0",
+        "subtasks": [
+            {
+                "id": "S1",
+                "title": "Land the primary implementation",
+                "description": "Fix auth flow",
+                "agent": "codex",
+                "model": "gpt-5.3-codex",
+                "effort": "high",
+                "worktreeStrategy": "isolated",
+                "dependsOn": [],
+                "filesHint": ["src/auth/session.ts"],
+                "prompt": "DoD: fix auth.\nBoundary: stay scoped.",
+            }
+        ],
+    },
+    ensure_ascii=False,
+    separators=(",", ":"),
+)
+
+
 def test_task_status_and_list_plans_read_tool_layer_state(tmp_path, monkeypatch) -> None:
     base = tmp_path / "ai-devops"
     tasks_root = base / "tasks" / "1730000000000-demo-repo-fix-auth"
     tasks_root.mkdir(parents=True)
-    (tasks_root / "plan.json").write_text(
-        json.dumps(
-            {
-                "planId": "1730000000000-demo-repo-fix-auth",
-                "repo": "demo-repo",
-                "title": "Fix auth flow",
-                "requestedBy": "alice#1234",
-                "requestedAt": 1730000000000,
-                "objective": "Fix auth flow",
-                "constraints": {},
-                "context": {},
-                "routing": {"agent": "codex", "model": "gpt-5.3-codex", "effort": "high"},
-                "version": "1.0",
-                "subtasks": [
-                    {
-                        "id": "S1",
-                        "title": "Land the primary implementation",
-                        "description": "Fix auth flow",
-                        "agent": "codex",
-                        "model": "gpt-5.3-codex",
-                        "effort": "high",
-                        "worktreeStrategy": "isolated",
-                        "dependsOn": [],
-                        "filesHint": ["src/auth/session.ts"],
-                        "prompt": "DoD: fix auth.\nBoundary: stay scoped.",
-                    }
-                ],
-            },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
-    )
+    (tasks_root / "plan.json").write_text(_PLAN_JSON, encoding="utf-8")
 
     # Set up database instead of JSON registry
     monkeypatch.setenv("AI_DEVOPS_HOME", str(base))
@@ -195,3 +201,14 @@ def test_build_plan_request_rejects_scoped_task_without_task_spec():
                 "mustTouch": ["/tmp/demo/skills/sonos-pure-play/scripts/query-planner.mjs"],
             },
         })
+
+
+def test_detect_risk_flags_reports_all_categories_on_overlapping_hits() -> None:
+    # 回归：secret_exfiltration 的贪婪 .{0,40} 会吞掉 rm -rf 的文本，
+    # 非重叠扫描曾因此漏报 dangerous_command。
+    assert detect_risk_flags("dump the database and rm -rf the old env") == [
+        "secret_exfiltration",
+        "dangerous_command",
+    ]
+    assert detect_risk_flags("rm -rf build artifacts") == ["dangerous_command"]
+    assert detect_risk_flags("refactor the auth flow") == []